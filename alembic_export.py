@@ -1,12 +1,231 @@
 import argparse
+import collections
+import contextlib
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import re
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from multiprocessing.pool import ThreadPool
 
-try:
-    import maya.standalone
-    maya.standalone.initialize()
-except RuntimeError:
-    pass
+# maya.cmds, imported by _initialize() when an export first needs Maya.
+cmds = None
 
-from maya import cmds
+
+def _initialize():
+    """
+    Initialize Maya standalone and import maya.cmds on first use.
+
+    Importing this module and parsing arguments stays cheap, Maya is only
+    booted once an export needs it. Inside a running Maya session the
+    session's maya.cmds is used.
+
+    Returns:
+        module: maya.cmds
+    """
+    global cmds
+    if cmds is None:
+        with _phase("initialize"):
+            try:
+                import maya.standalone
+                maya.standalone.initialize()
+            except RuntimeError:
+                pass
+
+            from maya import cmds as maya_cmds
+            cmds = maya_cmds
+
+    return cmds
+
+
+# Duration in seconds of the last run of each phase, like "initialize",
+# "open", "loadPlugin" and "export".
+_phases = collections.OrderedDict()
+
+# Phases run by every export, as opposed to once per process or scene.
+_EXPORT_PHASES = ("prune", "export", "transfer")
+
+
+@contextlib.contextmanager
+def _phase(name):
+    """
+    Time a phase of the export for profiling.
+
+    Args:
+        name (str): Name of the phase.
+    """
+    start = time.time()
+    try:
+        yield
+    finally:
+        _phases[name] = time.time() - start
+
+
+# Callables run by AbcExport for every sampled frame, see _on_frame().
+_frame_callbacks = []
+
+
+def _on_frame(frame):
+    """
+    Run the frame callbacks. Called by AbcExport through the python per frame
+    callback of the first job.
+
+    Args:
+        frame (float): Frame being evaluated.
+    """
+    for callback in _frame_callbacks:
+        callback(frame)
+
+
+# Python callables of the per frame callback of each job, by job index, see
+# _on_job_frame().
+_job_callbacks = {}
+
+
+def _on_job_frame(index, frame, bounds):
+    """
+    Run the python per frame callables of a job. Called by AbcExport through
+    the python per frame callback of the job.
+
+    Args:
+        index (int): Index of the job in the AbcExport call.
+        frame (float): Frame being evaluated.
+        bounds (list of float): Bounding box of the roots of the job as
+            [minX, minY, minZ, maxX, maxY, maxZ].
+    """
+    for callback in _job_callbacks[index]:
+        callback(frame, bounds)
+
+
+def _split_callables(callback):
+    """
+    Separate python callables from the code of a python callback argument.
+
+    Args:
+        callback (str, callable or list): Python code, a callable, or a list
+            of either.
+
+    Returns:
+        tuple: Code as a str, and a list of the callables.
+    """
+    if not isinstance(callback, (list, tuple)):
+        callback = [callback]
+    code = [item for item in callback if item and not callable(item)]
+    return "\n".join(code), [item for item in callback if callable(item)]
+
+
+def _load_plugin():
+    """Load the AbcExport plugin."""
+    with _phase("loadPlugin"):
+        cmds.loadPlugin("AbcExport.mll", quiet=True)
+
+
+def _open_scene(mayaFile, roots=None):
+    """
+    Open a Maya scene, discarding unsaved changes of the current scene.
+
+    Args:
+        mayaFile (str): File location of the Maya scene to open.
+        roots (list of str, optional): Only load the references that contain
+            or feed these dag paths, see _load_references(). Defaults to None,
+            which loads all references.
+    """
+    with _phase("open"):
+        if not roots:
+            cmds.file(mayaFile, open=True, force=True)
+            return
+
+        cmds.file(
+            mayaFile, open=True, force=True, loadReferenceDepth="none"
+        )
+        _load_references(roots)
+
+
+def _load_references(roots):
+    """
+    Load the unloaded references that contain or feed the given roots.
+
+    A reference contains a root when the root, or one of its parents, is in
+    the namespace of the reference. A reference feeds a root when one of its
+    connection edits connects it to a loaded reference that is needed, or to
+    a node upstream of a root. References are loaded until no more are
+    needed, as each loaded reference can bring in further connections.
+
+    Args:
+        roots (list of str): Maya dag paths that will be exported.
+    """
+    namespaces = set()
+    for root in roots:
+        for name in root.split("|"):
+            namespace = name.rpartition(":")[0]
+            while namespace:
+                namespaces.add(namespace)
+                namespace = namespace.rpartition(":")[0]
+
+    unloaded = {}
+    for node in cmds.ls(type="reference"):
+        try:
+            if cmds.referenceQuery(node, isLoaded=True):
+                continue
+            namespace = cmds.referenceQuery(node, namespace=True)
+        except RuntimeError:
+            # Reference nodes without a file, like sharedReferenceNode.
+            continue
+        unloaded[node] = namespace.lstrip(":")
+
+    while unloaded:
+        upstream = set()
+        existing = cmds.ls(roots, long=True)
+        if existing:
+            nodes = existing + (
+                cmds.listRelatives(
+                    existing, allDescendents=True, fullPath=True
+                ) or []
+            )
+            for node in cmds.listHistory(nodes) or []:
+                upstream.add(node.rpartition("|")[2])
+
+        needed = []
+        for node, namespace in unloaded.items():
+            if namespace in namespaces:
+                needed.append(node)
+                continue
+
+            edits = cmds.referenceQuery(
+                node, editStrings=True, editCommand="connectAttr"
+            ) or []
+            for edit in edits:
+                plugs = re.findall(r'"([^"]+)"', edit)
+                if len(plugs) < 2:
+                    continue
+                source, destination = [
+                    plug.split(".")[0].rpartition("|")[2]
+                    for plug in plugs[:2]
+                ]
+                if source.rpartition(":")[0] != namespace:
+                    continue
+                if (destination in upstream or
+                        destination.rpartition(":")[0] in namespaces):
+                    needed.append(node)
+                    break
+
+        if not needed:
+            break
+
+        for node in needed:
+            print("Loading reference: {0}".format(node))
+            cmds.file(loadReference=node)
+            namespaces.add(unloaded.pop(node))
 
 
 def cli():
@@ -301,29 +520,458 @@ def cli():
         type=str,
         action="store",
         dest="alembicFile",
-        required=True,
-        help="File location to write the Alembic data."
+        help="File location to write the Alembic data. Required unless "
+        "-jobFile is used."
+    )
+    parser.add_argument(
+        "-jf", "-jobFile",
+        type=str,
+        action="store",
+        dest="jobFile",
+        help="JSON file with a list of jobs to export in a single scene "
+        "evaluation pass. Each job is an object with an \"alembicFile\" and "
+        "any of the job flags of this script, for example "
+        "{\"alembicFile\": \"char.abc\", \"root\": [\"|char\"]}. Job flags "
+        "given on the command line are used as defaults for every job. A "
+        "file with a single job may use any argument of export()."
     )
     parser.add_argument(
         "-mf", "-mayaFile",
         type=str,
         action="store",
         dest="mayaFile",
-        required=True,
-        help="File location of the Maya scene to open."
+        help="File location of the Maya scene to open. Required unless "
+        "-worker or -manifest is used."
+    )
+    parser.add_argument(
+        "-wk", "-worker",
+        type=str,
+        action="store",
+        dest="worker",
+        help="Run as a persistent worker that processes job files from this "
+        "spool directory, keeping Maya and the AbcExport plugin loaded "
+        "between jobs. See worker() for the job file format."
+    )
+    parser.add_argument(
+        "-mj", "-maxJobs",
+        type=int,
+        action="store",
+        default=0,
+        dest="maxJobs",
+        help="Number of jobs a worker processes before exiting, so a "
+        "supervisor can start a fresh process and reclaim leaked memory. "
+        "Defaults to 0, which means no limit."
+    )
+    parser.add_argument(
+        "-mn", "-manifest",
+        type=str,
+        action="store",
+        dest="manifest",
+        help="JSON manifest with a list of exports across any number of Maya "
+        "scenes. Each export is an object with a \"mayaFile\", an "
+        "\"alembicFile\" and any of the arguments of export(). Each scene is "
+        "opened only once."
+    )
+    parser.add_argument(
+        "-rs", "-results",
+        type=str,
+        action="store",
+        dest="results",
+        help="File location to write the per export result records of "
+        "-manifest to."
+    )
+    parser.add_argument(
+        "-sh", "-shards",
+        type=int,
+        action="store",
+        default=0,
+        dest="shards",
+        help="Split the frame ranges into this many shards and export them "
+        "in parallel mayapy processes. Each shard is written to its own "
+        "archive next to the Alembic file, listed in order in a "
+        "\"<alembicFile>.shards.json\" index. The scene is reopened from "
+        "disk by every process, so unsaved changes are not exported."
+    )
+    parser.add_argument(
+        "-nw", "-workers",
+        type=int,
+        action="store",
+        default=0,
+        dest="workers",
+        help="Number of mayapy processes to run at once for -shards and "
+        "-partitions. Defaults to the number of cores."
+    )
+    parser.add_argument(
+        "-pt", "-partitions",
+        type=int,
+        action="store",
+        default=0,
+        dest="partitions",
+        help="Export the -root nodes to up to this many archives in parallel "
+        "mayapy processes. Roots of the same rig are kept together, and each "
+        "process only loads the references of its roots. The archives are "
+        "mapped to their roots in a \"<alembicFile>.partitions.json\" index."
+    )
+    parser.add_argument(
+        "-spr", "-shardPreRoll",
+        type=float,
+        action="store",
+        default=None,
+        dest="shardPreRoll",
+        help="Number of frames to evaluate, without writing them, before the "
+        "start of every shard or chunk but the first, so time dependent "
+        "setups have run-up. Defaults to as many frames as "
+        "-preRollStartFrame evaluates before the first frame."
+    )
+    parser.add_argument(
+        "-cd", "-cacheDir",
+        type=str,
+        action="store",
+        default=os.environ.get("ALEMBIC_EXPORT_CACHE_DIR"),
+        dest="cacheDir",
+        help="Directory of a local export cache. When the Maya file, its "
+        "references and the export arguments are unchanged since an earlier "
+        "export, the cached Alembic file is reused without opening the "
+        "scene. Defaults to the ALEMBIC_EXPORT_CACHE_DIR environment "
+        "variable."
+    )
+    parser.add_argument(
+        "-cs", "-cacheSize",
+        type=float,
+        action="store",
+        default=10240,
+        dest="cacheSize",
+        help="Size limit of the export cache in megabytes. The least recently "
+        "used exports are removed beyond it. Defaults to 10240."
+    )
+    parser.add_argument(
+        "-nc", "-noCache",
+        action="store_true",
+        default=False,
+        dest="noCache",
+        help="If this flag is present the export cache is not used."
+    )
+    parser.add_argument(
+        "-pf", "-profile",
+        type=str,
+        action="store",
+        nargs="?",
+        const=True,
+        dest="profile",
+        help="Write a JSON report with the time spent in each phase of the "
+        "export, the time of every sampled frame, the slowest frames, frames "
+        "per second and peak memory. Without a value the report is written "
+        "to \"<alembicFile>.profile.json\"."
+    )
+    parser.add_argument(
+        "-st", "-stats",
+        type=str,
+        action="store",
+        nargs="?",
+        const=True,
+        dest="stats",
+        help="Read the written archive back with PyAlembic and write a JSON "
+        "report of the samples and bytes of every object and property, "
+        "largest objects first. Without a value the report is written to "
+        "\"<alembicFile>.stats.json\"."
+    )
+    parser.add_argument(
+        "-sr", "-selectiveReferences",
+        action="store_true",
+        default=False,
+        dest="selectiveReferences",
+        help="If this flag is present the Maya scene is opened with its "
+        "references unloaded, and only the references that contain or feed "
+        "the -root nodes are loaded."
+    )
+    parser.add_argument(
+        "-pn", "-prune",
+        action="store_true",
+        default=False,
+        dest="prune",
+        help="If this flag is present the deformers, constraints, "
+        "expressions, animation curves and other evaluated nodes that are "
+        "not upstream of the -root nodes are disabled during the export."
+    )
+    parser.add_argument(
+        "-em", "-evaluationMode",
+        type=str,
+        action="store",
+        dest="evaluationMode",
+        choices=["parallel", "serial", "off"],
+        help="Evaluation Manager mode to export with. \"off\" is DG "
+        "evaluation. The mode of the scene is used if not present."
+    )
+    parser.add_argument(
+        "-tc", "-threadCount",
+        type=int,
+        action="store",
+        dest="threadCount",
+        help="Number of threads Maya evaluates with, 0 means all cores."
+    )
+    parser.add_argument(
+        "-cp", "-cachedPlayback",
+        type=int,
+        action="store",
+        dest="cachedPlayback",
+        choices=[0, 1],
+        help="Enable (1) or disable (0) the cached playback evaluator."
+    )
+    parser.add_argument(
+        "-gpu", "-gpuOverride",
+        type=int,
+        action="store",
+        dest="gpuOverride",
+        choices=[0, 1],
+        help="Enable (1) or disable (0) the GPU override."
+    )
+    parser.add_argument(
+        "-ss", "-splitStatic",
+        action="store_true",
+        default=False,
+        dest="splitStatic",
+        help="If this flag is present the roots without time dependent "
+        "inputs are written with a single sample to "
+        "\"<alembicFile>.static.abc\", and only the animated roots are "
+        "sampled on every frame."
+    )
+    parser.add_argument(
+        "-sd", "-scratchDir",
+        type=str,
+        action="store",
+        default=os.environ.get("ALEMBIC_EXPORT_SCRATCH_DIR"),
+        dest="scratchDir",
+        help="Local directory to write the Alembic data to during the "
+        "export. The finished file is copied to its destination in one "
+        "sequential transfer and renamed into place. Defaults to the "
+        "ALEMBIC_EXPORT_SCRATCH_DIR environment variable."
+    )
+    parser.add_argument(
+        "-ck", "-checksum",
+        action="store_true",
+        default=False,
+        dest="checksum",
+        help="If this flag is present the transfer from -scratchDir is "
+        "verified with a SHA-1 checksum, which is written to "
+        "\"<alembicFile>.sha1\"."
+    )
+    parser.add_argument(
+        "-chs", "-chunkSize",
+        type=float,
+        action="store",
+        default=0,
+        dest="chunkSize",
+        help="Split the frame ranges into chunks of about this many frames, "
+        "each written to its own archive and listed in order in "
+        "\"<alembicFile>.chunks.json\". Finished chunks are recorded in "
+        "\"<alembicFile>.checkpoint.json\", so running the same command "
+        "again only exports the missing chunks."
+    )
+    parser.add_argument(
+        "-mb", "-memoryBudget",
+        type=float,
+        action="store",
+        default=0,
+        dest="memoryBudget",
+        help="Memory budget in megabytes. The export runs in a separate "
+        "mayapy process that stops when it gets close to the budget, after "
+        "which the unfinished frame range is split in two and retried in "
+        "fresh processes."
+    )
+    parser.add_argument(
+        "-pg", "-progress",
+        type=str,
+        action="store",
+        dest="progress",
+        help="Stream progress events as JSON lines to a file descriptor, a "
+        "local socket as host:port, a Unix domain socket or a file."
+    )
+    parser.add_argument(
+        "-pl", "-plan",
+        type=str,
+        action="store",
+        nargs="?",
+        const=True,
+        dest="plan",
+        help="Instead of exporting, open the scene and write a JSON plan with "
+        "the objects, vertices and samples the export would write, its "
+        "estimated size and duration, and a recommended number of -shards. "
+        "Without a value the plan is printed."
     )
 
     args = vars(parser.parse_args())
 
-    mayaFile = args["mayaFile"]
-    del args["mayaFile"]
-    alembicFile = args["alembicFile"]
-    del args["alembicFile"]
+    mayaFile = args.pop("mayaFile")
+    alembicFile = args.pop("alembicFile")
+    jobFile = args.pop("jobFile")
+    spoolDir = args.pop("worker")
+    maxJobs = args.pop("maxJobs")
+    manifest = args.pop("manifest")
+    results = args.pop("results")
+    planFile = args.pop("plan")
+    selectiveReferences = args.pop("selectiveReferences")
+    if args.pop("noCache"):
+        args["cacheDir"] = None
+
+    job_args = _argument_names(_job_arg)
+    defaults = dict(zip(job_args[1:], _job_arg.__defaults__))
+
+    # Validate arguments before booting Maya, so bad submissions fail fast.
+    if spoolDir:
+        if not os.path.isdir(spoolDir):
+            parser.error(
+                "spool directory does not exist: {0}".format(spoolDir)
+            )
+        worker(spoolDir, maxJobs=maxJobs)
+        return
+
+    if manifest:
+        try:
+            with open(manifest) as f:
+                exports = json.load(f)
+        except (IOError, ValueError) as e:
+            parser.error("could not read manifest: {0}".format(e))
+        if not isinstance(exports, list) or not all(
+                isinstance(entry, dict) for entry in exports):
+            parser.error("manifest must contain a list of exports")
+
+        problems = []
+        for entry in exports:
+            if not os.path.isfile(entry.get("mayaFile") or ""):
+                problems.append(
+                    _problem(
+                        entry.get("alembicFile"),
+                        "mayaFile",
+                        "does not exist: {0}".format(entry.get("mayaFile"))
+                    )
+                )
+            spec = dict(defaults)
+            spec.update(entry)
+            problems += _check_output(entry.get("alembicFile"))
+            problems += _check_job(spec, alembicFile=entry.get("alembicFile"))
+        if problems:
+            parser.error(str(ValidationError(problems)))
+
+        batch(exports, results=results)
+        return
+
+
+    if not mayaFile:
+        parser.error("argument -mf/-mayaFile is required unless -worker or "
+                     "-manifest is used")
+    if not os.path.isfile(mayaFile):
+        parser.error("Maya file does not exist: {0}".format(mayaFile))
+    if not alembicFile and not jobFile and not planFile:
+        parser.error("one of the arguments -alembicFile -jobFile is required")
+
+    jobs = None
+    if jobFile:
+        try:
+            with open(jobFile) as f:
+                jobs = json.load(f)
+        except (IOError, ValueError) as e:
+            parser.error("could not read job file: {0}".format(e))
+        if not isinstance(jobs, list):
+            parser.error("job file must contain a list of jobs")
+
+    # A single job supports every argument of export().
+    spec = None
+    if jobs is None:
+        spec = dict(args, alembicFile=alembicFile)
+    elif len(jobs) == 1:
+        spec = dict(args)
+        spec.update(jobs[0])
+
+    if planFile and not spec:
+        parser.error("argument -plan can not be used with multiple jobs")
+
+    problems = []
+    for job in [spec] if spec else jobs:
+        if not planFile:
+            problems += _check_output(job.get("alembicFile"))
+        problems += _check_job(
+            dict((key, job.get(key, args.get(key))) for key in job_args[1:]),
+            alembicFile=job.get("alembicFile")
+        )
+    if jobs and not spec:
+        problems += _check_outputs_unique(jobs)
+    if problems:
+        parser.error(str(ValidationError(problems)))
+
+    # Reuse a cached export before booting Maya.
+    if spec and not planFile and _cacheable(spec):
+        key = _cache_key(
+            mayaFile,
+            dict((key, spec[key]) for key in spec if key in job_args[1:]),
+            spec["dontSkipUnwrittenFrames"],
+            spec["preRollStartFrame"]
+        )
+        if _fetch_cache(spec["cacheDir"], key, spec["alembicFile"]):
+            if spec.get("progress") is not None:
+                reporter = _Progress(spec["progress"], spec["alembicFile"], 0)
+                reporter.end("cached")
+            return
+
+    # Only the references needed for the exported roots are loaded, unless a
+    # job exports the whole scene.
+    roots = None
+    if selectiveReferences:
+        roots = []
+        for job in [spec] if spec else jobs:
+            job_roots = job.get("root", args["root"])
+            if not job_roots:
+                roots = None
+                break
+            roots.extend(job_roots)
 
     # Opening Maya file
-    cmds.file(mayaFile, open=True)
+    _initialize()
+    _open_scene(mayaFile, roots=roots)
+
+    if planFile:
+        report = json.dumps(plan(**spec), indent=4)
+        if planFile is True:
+            print(report)
+        else:
+            with open(planFile, "w") as f:
+                f.write(report)
+        return
+
+    if spec:
+        # The scene is discarded afterwards.
+        spec.setdefault("restorePruned", False)
+        export(**spec)
+        return
+
+    # Evaluation arguments apply to the whole pass, the job arguments are
+    # defaults for each job.
+    evaluation_args = {"restorePruned": False}
+    for key in ("dontSkipUnwrittenFrames",
+                "verbose",
+                "preRollStartFrame",
+                "prune",
+                "evaluationMode",
+                "threadCount",
+                "cachedPlayback",
+                "gpuOverride",
+                "scratchDir",
+                "checksum",
+                "progress"):
+        evaluation_args[key] = args.pop(key)
+
+    for key, value in args.items():
+        if key not in job_args and value != parser.get_default(key):
+            parser.error(
+                "argument -{0} cannot be used with multiple jobs".format(key)
+            )
 
-    export(alembicFile, **args)
+    job_specs = []
+    for job in jobs:
+        spec = dict((key, args[key]) for key in args if key in job_args)
+        spec.update(job)
+        job_specs.append(spec)
+
+    export_jobs(job_specs, **evaluation_args)
 
 
 def export(alembicFile,
@@ -356,11 +1004,35 @@ def export(alembicFile,
            stripNamespaces=-1,
            dontSkipUnwrittenFrames=False,
            verbose=False,
-           preRollStartFrame=0
+           preRollStartFrame=0,
+           shards=0,
+           workers=0,
+           shardPreRoll=None,
+           cacheDir=None,
+           cacheSize=10240,
+           profile=None,
+           prune=False,
+           restorePruned=True,
+           evaluationMode=None,
+           threadCount=None,
+           cachedPlayback=None,
+           gpuOverride=None,
+           splitStatic=False,
+           scratchDir=None,
+           checksum=False,
+           chunkSize=0,
+           memoryBudget=0,
+           progress=None,
+           partitions=0,
+           stats=None
            ):
     """
     Export Alembic.
 
+    The arguments, the output directory and the roots in the open scene are
+    checked before any frame is evaluated, and every problem found is raised
+    together as a ValidationError.
+
     Args:
         alembicFile (str): File location to write the Alembic data.
         eulerFilter (bool, optional): Apply Euler filter while sampling
@@ -411,10 +1083,15 @@ def export(alembicFile,
         melPostJobCallback (str, optional): When the translation has finished
             the string specified is evaluated as a Mel command. See below for
             special processing rules. Defaults to "".
-        pythonPerFrameCallback (str, optional): When each frame
-            (and the static frame) is evaluated the string specified is
+        pythonPerFrameCallback (str, callable or list, optional): When each
+            frame (and the static frame) is evaluated the string specified is
             evaluated as a python command. See below for special processing
-            rules. Defaults to "".
+            rules. Callables are called in this process with the frame and the
+            bounding box of the roots as [minX, minY, minZ, maxX, maxY, maxZ].
+            A list can combine several strings and callables, run in order.
+            Callables can not be used with shards, memoryBudget or
+            partitions, as those export in separate processes. Defaults to
+            "".
         pythonPostJobCallback (str, optional): When the translation has
             finished the string specified is evaluated as a python command. See
             below for special processing rules. Defaults to "".
@@ -455,6 +1132,108 @@ def export(alembicFile,
             evaluation at.  This is used to set the starting frame for time
             dependent translations and can be used to evaluate run-up that
             isn't actually translated. Defaults to 0.
+        shards (int, optional): Split the frame ranges into this many shards
+            and export them in parallel mayapy processes. Each shard is
+            written to "<alembicFile>.shard<number>.abc", and the shards are
+            listed in order in "<alembicFile>.shards.json". The scene is
+            reopened from disk by every process, so it has to be saved and
+            unsaved changes are not exported. Defaults to 0, which exports in
+            this process.
+        workers (int, optional): Number of mayapy processes to run at once
+            for shards and partitions. Defaults to 0, which means the number
+            of cores.
+        shardPreRoll (float, optional): Number of frames to evaluate, without
+            writing them, before the start of every shard or chunk but the
+            first, so time dependent setups have run-up. Defaults to None,
+            which evaluates as many frames as preRollStartFrame does before
+            the first frame.
+        cacheDir (str, optional): Directory of a local export cache. When the
+            saved scene, its references and the export arguments are
+            unchanged since an earlier export, the cached Alembic file is
+            linked or copied to alembicFile instead of exporting. Scenes with
+            unsaved changes, exports split into several files, exports with
+            profile or stats reports and exports with python callables are
+            not cached. Defaults to None, which disables the cache.
+        cacheSize (float, optional): Size limit of the export cache in
+            megabytes. The least recently used exports are removed beyond it.
+            Defaults to 10240.
+        profile (bool or str, optional): Write a JSON report with the time
+            spent in each phase of the export, the time of every sampled
+            frame, the slowest frames, frames per second and peak memory.
+            True writes it to "<alembicFile>.profile.json", a string is the
+            file location to write it to. Sharded exports write a report per
+            shard. Defaults to None, which disables profiling.
+        prune (bool, optional): Disable the deformers, constraints,
+            expressions, animation curves and other evaluated nodes that are
+            not upstream of the roots for the duration of the export, so
+            evaluation cost scales with what is exported. Has no effect when
+            the whole scene is exported. Defaults to False.
+        restorePruned (bool, optional): Enable the nodes disabled by prune
+            again after the export. The command line skips this, as the
+            scene is discarded afterwards. Defaults to True.
+        evaluationMode (str, optional): Evaluation Manager mode to export
+            with, "parallel", "serial" or "off" for DG evaluation. Defaults to
+            None, which keeps the current mode.
+        threadCount (int, optional): Number of threads Maya evaluates with,
+            0 means all cores. Defaults to None, which keeps the current
+            count.
+        cachedPlayback (bool, optional): Enable or disable the cached
+            playback evaluator. Defaults to None, which keeps it as is.
+        gpuOverride (bool, optional): Enable or disable the GPU override
+            (deformer evaluator). Defaults to None, which keeps it as is.
+        splitStatic (bool, optional): Write the roots without time dependent
+            inputs to "<alembicFile>.static.abc" with a single sample, and
+            only sample the animated roots on every frame. Both files are
+            written in the same pass. Roots are split as a whole, pass finer
+            roots to split more of the scene. When every root is static they
+            are all written to alembicFile. Defaults to False.
+        scratchDir (str, optional): Local directory to write the Alembic
+            data to during the export. The finished file is then copied next
+            to alembicFile in one sequential transfer and renamed into place,
+            so readers never see a partial file. Defaults to None, which
+            writes to alembicFile directly.
+        checksum (bool, optional): Verify the transfer from scratchDir with a
+            SHA-1 checksum, which is also written to "<alembicFile>.sha1".
+            Defaults to False.
+        chunkSize (float, optional): Split the frame ranges into chunks of
+            about this many frames, exported one after another to
+            "<alembicFile>.chunk<number>.abc" and listed in order in
+            "<alembicFile>.chunks.json". Finished chunks are recorded in
+            "<alembicFile>.checkpoint.json", so running the same export again
+            after a crash only exports the missing chunks. Defaults to 0,
+            which exports in one piece.
+        memoryBudget (float, optional): Memory budget in megabytes. The
+            export runs in a separate mayapy process that stops when its
+            memory gets within 10% of the budget. The unfinished frame range
+            is then split in two and retried in fresh processes. When the
+            export had to be split, the parts are written to
+            "<alembicFile>.part<number>.abc" and listed in order in
+            "<alembicFile>.parts.json". The scene is reopened from disk, so
+            it has to be saved. Defaults to 0, which means no budget.
+        progress (int or str, optional): Where to stream progress events to
+            as JSON lines: a file descriptor, a local socket as "host:port",
+            the path of a Unix domain socket, or a file to append to. There is
+            a "start" event, a "frame" event for every sampled frame with the
+            "elapsed" seconds, "framesPerSecond" and "eta", and an "end" event
+            with the "status" and "size" of the output. Shards, chunks,
+            partitions and memoryBudget parts report their own events. Other
+            processes can not write to a file descriptor, so it only receives
+            the start and end of the whole export from shards, partitions
+            and memoryBudget. Defaults to None.
+        partitions (int, optional): Export the roots to up to this many
+            archives in parallel mayapy processes, at most workers at a time.
+            Roots are grouped by the namespace of their rig, and the groups
+            balanced across the archives by their number of nodes. Each
+            archive is written to "<alembicFile>.partition<number>.abc" by a
+            process that only loads the references of its roots, and
+            "<alembicFile>.partitions.json" maps every root to its archive.
+            Can not be combined with shards, chunkSize or memoryBudget. The
+            scene has to be saved. Defaults to 0, which exports in this
+            process.
+        stats (bool or str, optional): Read the archive back after the export
+            and write a report of where its size goes, see archive_stats().
+            True writes it to "<alembicFile>.stats.json", a string is the
+            file location to write it to. Needs PyAlembic. Defaults to None.
 
     Special callback information:
     On the callbacks, special tokens are replaced with other data, these tokens
@@ -471,12 +1250,9 @@ def export(alembicFile,
     In Mel: {minX, minY, minZ, maxX, maxY, maxZ}
     In Python: [minX, minY, minZ, maxX, maxY, maxZ]
     """
+    _initialize()
 
-    # Generate job add_argument
-    jobArg = ""
-
-    # Boolean flags
-    booleans = {
+    job = {
         "eulerFilter": eulerFilter,
         "noNormals": noNormals,
         "preRoll": preRoll,
@@ -489,65 +1265,3120 @@ def export(alembicFile,
         "worldSpace": worldSpace,
         "writeVisibility": writeVisibility,
         "writeUVSets": writeUVSets,
-        "writeCreases": writeCreases
-    }
-    for key, value in booleans.iteritems():
-        if value:
-            jobArg += " -{0}".format(key)
-
-    # Single argument flags
-    single_arguments = {
+        "writeCreases": writeCreases,
         "dataFormat": dataFormat,
         "step": step,
         "melPerFrameCallback": melPerFrameCallback,
         "melPostJobCallback": melPostJobCallback,
         "pythonPerFrameCallback": pythonPerFrameCallback,
-        "pythonPostJobCallback": pythonPostJobCallback
-    }
-    for key, value in single_arguments.iteritems():
-        if value:
-            jobArg += " -{0} \"{1}\"".format(key, value)
-
-    # Multiple arguments flags
-    multiple_arguments = {
+        "pythonPostJobCallback": pythonPostJobCallback,
+        "userAttr": userAttr,
+        "userAttrPrefix": userAttrPrefix,
         "attr": attr,
         "attrPrefix": attrPrefix,
         "root": root,
-        "userAttrPrefix": userAttrPrefix,
-        "userAttr": userAttr,
-        "frameRelativeSample": frameRelativeSample
+        "frameRelativeSample": frameRelativeSample,
+        "frameRange": frameRange,
+        "stripNamespaces": stripNamespaces
     }
-    for key, value in multiple_arguments.iteritems():
-        for item in value:
-            jobArg += " -{0} \"{1}\"".format(key, item)
-
-    # frame range flag
-    for start, end in frameRange:
-        jobArg += " -frameRange {0} {1}".format(start, end)
-
-    # strip namespaces flag
-    if stripNamespaces == 0:
-        jobArg += " -stripNamespaces"
-    if stripNamespaces > 0:
-        jobArg += " -stripNamespaces {0}".format(stripNamespaces)
-
-    # file flag
-    # Alembic exporter does not like back slashes
-    jobArg += " -file {0}".format(alembicFile.replace("\\", "/"))
-
-    # Execute export
-    cmds.loadPlugin("AbcExport.mll", quiet=True)
 
-    export_args = {
+    # Arguments passed on to the export of each shard or chunk.
+    options = {
         "dontSkipUnwrittenFrames": dontSkipUnwrittenFrames,
         "verbose": verbose,
         "preRollStartFrame": preRollStartFrame,
-        "jobArg": jobArg
+        "profile": profile,
+        "stats": stats,
+        "prune": prune,
+        "evaluationMode": evaluationMode,
+        "threadCount": threadCount,
+        "cachedPlayback": cachedPlayback,
+        "gpuOverride": gpuOverride,
+        "scratchDir": scratchDir,
+        "checksum": checksum,
+        "progress": progress
     }
 
-    print("Exporting with: {0}".format(export_args))
+    # Fail before any frame is evaluated.
+    problems = (
+        _check_output(alembicFile) +
+        _check_job(job, alembicFile=alembicFile) +
+        _check_scene(job, alembicFile=alembicFile)
+    )
+    if stats:
+        try:
+            import alembic  # noqa: F401
+        except ImportError:
+            problems.append(
+                _problem(alembicFile, "stats", "PyAlembic is not available")
+            )
+    if problems:
+        raise ValidationError(problems)
+
+    callables = _split_callables(pythonPerFrameCallback)[1]
+    if callables and (shards > 1 or memoryBudget or partitions > 1):
+        raise ValueError(
+            "Python callables can not be used with shards, memoryBudget or "
+            "partitions, which export in separate processes."
+        )
+
+    frame_count = len(_sample_times(frameRange, step, frameRelativeSample))
+
+    # Child processes do not inherit file descriptors, so this process sends
+    # the start and end of their export to one instead.
+    parent_progress = None
+    process_options = options
+    if _progress_fd(progress) is not None:
+        parent_progress = progress
+        process_options = dict(options, progress=None)
+
+    if partitions > 1:
+        if shards > 1 or chunkSize or memoryBudget:
+            raise ValueError(
+                "partitions can not be combined with shards, chunkSize or "
+                "memoryBudget."
+            )
+        with _progress(parent_progress, alembicFile, frame_count):
+            _export_partitions(
+                alembicFile,
+                job,
+                partitions,
+                process_options,
+                workers=workers
+            )
+        return
+
+    if shards > 1:
+        with _progress(parent_progress, alembicFile, frame_count):
+            _export_shards(
+                alembicFile,
+                job,
+                shards,
+                process_options,
+                workers=workers,
+                shardPreRoll=shardPreRoll
+            )
+        return
+
+    if chunkSize:
+        _export_chunks(
+            alembicFile,
+            job,
+            chunkSize,
+            options,
+            shardPreRoll=shardPreRoll
+        )
+        return
+
+    if memoryBudget:
+        with _progress(parent_progress, alembicFile, frame_count):
+            _export_within_budget(
+                alembicFile,
+                job,
+                memoryBudget,
+                process_options,
+                shardPreRoll=shardPreRoll
+            )
+        return
+
+    key = None
+    cacheable = _cacheable(
+        {
+            "cacheDir": cacheDir,
+            "shards": shards,
+            "partitions": partitions,
+            "chunkSize": chunkSize,
+            "memoryBudget": memoryBudget,
+            "splitStatic": splitStatic,
+            "profile": profile,
+            "stats": stats,
+            "pythonPerFrameCallback": pythonPerFrameCallback
+        }
+    )
+    mayaFile = cmds.file(query=True, sceneName=True)
+    if (cacheable and mayaFile and
+            not cmds.file(query=True, modified=True)):
+        key = _cache_key(
+            mayaFile, job, dontSkipUnwrittenFrames, preRollStartFrame
+        )
+        if _fetch_cache(cacheDir, key, alembicFile):
+            if progress is not None:
+                reporter = _Progress(progress, alembicFile, 0)
+                reporter.end("cached")
+            return
+
+    # Phases of an earlier export of this process are not part of this one.
+    for name in _EXPORT_PHASES:
+        _phases.pop(name, None)
+
+    callbacks = []
+    profiler = None
+    if profile:
+        profiler = _Profiler()
+        callbacks.append(profiler)
+    if os.environ.get(_MEMORY_LIMIT_VARIABLE):
+        callbacks.append(
+            _MemoryWatchdog(
+                int(os.environ[_MEMORY_LIMIT_VARIABLE]),
+                report=os.environ.get(_MEMORY_REPORT_VARIABLE)
+            )
+        )
+    reporter = None
+    if progress is not None:
+        reporter = _Progress(progress, alembicFile, frame_count or 1)
+        callbacks.append(reporter)
+
+    status = "failed"
+    _frame_callbacks.extend(callbacks)
+    try:
+        with _pruned(root if prune else None, restore=restorePruned), \
+                _evaluation_settings(
+                    evaluationMode=evaluationMode,
+                    threadCount=threadCount,
+                    cachedPlayback=cachedPlayback,
+                    gpuOverride=gpuOverride):
+            jobs = [dict(job, alembicFile=alembicFile)]
+            if splitStatic:
+                jobs = _split_static(jobs[0])
+            with _scratch(jobs, scratchDir, checksum=checksum) as jobs:
+                _abc_export(
+                    jobs,
+                    dontSkipUnwrittenFrames=dontSkipUnwrittenFrames,
+                    verbose=verbose,
+                    preRollStartFrame=preRollStartFrame
+                )
+        status = "done"
+    finally:
+        for callback in callbacks:
+            _frame_callbacks.remove(callback)
+        if reporter:
+            reporter.end(status)
+
+    if profiler:
+        if profile is True:
+            profile = os.path.splitext(alembicFile)[0] + ".profile.json"
+        profiler.write(profile, alembicFile)
+
+    if stats:
+        archive_stats(alembicFile, None if stats is True else stats)
+
+    if key:
+        _store_cache(cacheDir, key, alembicFile, cacheSize)
+
+
+class ValidationError(ValueError):
+    """
+    Problems with an export found before evaluating the scene.
+
+    Attributes:
+        problems (list of dict): Every problem found, with the "argument" it
+            concerns, a "message" and the "alembicFile" of its job.
+    """
+
+    def __init__(self, problems):
+        self.problems = problems
+        lines = [
+            "{0} problem{1} with the export:".format(
+                len(problems), "" if len(problems) == 1 else "s"
+            )
+        ]
+        for problem in problems:
+            lines.append(
+                "  {0} -{1}: {2}".format(
+                    problem["alembicFile"],
+                    problem["argument"],
+                    problem["message"]
+                )
+            )
+        super(ValidationError, self).__init__("\n".join(lines))
+
+
+def _problem(alembicFile, argument, message):
+    """Build a problem record of ValidationError."""
+    return {"alembicFile": alembicFile, "argument": argument,
+            "message": message}
+
+
+def _check_output(alembicFile):
+    """
+    Check that an Alembic file can be written, without Maya.
+
+    Args:
+        alembicFile (str): File location to write the Alembic data.
+
+    Returns:
+        list of dict: Problems found, see ValidationError.
+    """
+    if not alembicFile:
+        return [_problem(alembicFile, "alembicFile", "is required")]
+
+    directory = os.path.dirname(os.path.abspath(alembicFile))
+    if not os.path.isdir(directory):
+        return [
+            _problem(
+                alembicFile,
+                "alembicFile",
+                "directory does not exist: {0}".format(directory)
+            )
+        ]
+    if not os.access(directory, os.W_OK):
+        return [
+            _problem(
+                alembicFile,
+                "alembicFile",
+                "directory is not writable: {0}".format(directory)
+            )
+        ]
+    return []
+
+
+def _check_outputs_unique(jobs):
+    """
+    Check that jobs do not write the same Alembic file.
+
+    Args:
+        jobs (list of dict): Jobs with an "alembicFile".
+
+    Returns:
+        list of dict: Problems found, see ValidationError.
+    """
+    seen = set()
+    problems = []
+    for job in jobs:
+        path = job.get("alembicFile")
+        if not path:
+            continue
+        path = os.path.normcase(os.path.abspath(path))
+        if path in seen:
+            problems.append(
+                _problem(
+                    job["alembicFile"],
+                    "alembicFile",
+                    "is written by more than one job"
+                )
+            )
+        seen.add(path)
+    return problems
+
+
+def _check_job(job, alembicFile=None):
+    """
+    Check the arguments of a job, without Maya.
+
+    Args:
+        job (dict): Job arguments of export().
+        alembicFile (str, optional): Alembic file of the job, to report
+            problems with. Defaults to the "alembicFile" of the job.
+
+    Returns:
+        list of dict: Problems found, see ValidationError.
+    """
+    alembicFile = alembicFile or job.get("alembicFile")
+    problems = []
+
+    if job["dataFormat"] not in ("HDF", "Ogawa"):
+        problems.append(
+            _problem(
+                alembicFile,
+                "dataFormat",
+                "must be HDF or Ogawa, not {0}".format(job["dataFormat"])
+            )
+        )
+    if job["step"] <= 0:
+        problems.append(
+            _problem(alembicFile, "step", "must be greater than 0")
+        )
+
+    for start, end in job["frameRange"]:
+        if start > end:
+            problems.append(
+                _problem(
+                    alembicFile,
+                    "frameRange",
+                    "start is after its end: {0} {1}".format(start, end)
+                )
+            )
+    # Reversed ranges are reported above already.
+    ranges = sorted(
+        [start, end] for start, end in job["frameRange"] if start <= end
+    )
+    for previous, current in zip(ranges, ranges[1:]):
+        if current[0] <= previous[1]:
+            problems.append(
+                _problem(
+                    alembicFile,
+                    "frameRange",
+                    "{0} {1} overlaps {2} {3}".format(
+                        previous[0], previous[1], current[0], current[1]
+                    )
+                )
+            )
+
+    return problems
+
+
+def _check_scene(job, alembicFile=None):
+    """
+    Check the roots of a job against the open scene.
+
+    Roots have to exist, be unique dag nodes and not be below another root.
+    With stripNamespaces, no two written objects may end up with the same
+    path.
+
+    Args:
+        job (dict): Job arguments of export().
+        alembicFile (str, optional): Alembic file of the job, to report
+            problems with. Defaults to the "alembicFile" of the job.
+
+    Returns:
+        list of dict: Problems found, see ValidationError.
+    """
+    alembicFile = alembicFile or job.get("alembicFile")
+    problems = []
+
+    roots = []
+    for root in job["root"]:
+        matches = cmds.ls(root, long=True, type="dagNode")
+        if not matches:
+            problems.append(
+                _problem(
+                    alembicFile,
+                    "root",
+                    "no dag node matches {0}".format(root)
+                )
+            )
+        elif len(matches) > 1:
+            problems.append(
+                _problem(
+                    alembicFile,
+                    "root",
+                    "more than one node matches {0}: {1}".format(
+                        root, ", ".join(matches)
+                    )
+                )
+            )
+        else:
+            roots.append(matches[0])
+
+    for root in roots:
+        for other in roots:
+            if root.startswith(other + "|"):
+                problems.append(
+                    _problem(
+                        alembicFile,
+                        "root",
+                        "{0} is below the root {1}".format(root, other)
+                    )
+                )
+
+    if job["stripNamespaces"] < 0:
+        return problems
+
+    # Roots are written at the top of the archive.
+    written = {}
+    for root in roots or cmds.ls(assemblies=True, long=True):
+        parent = root.rpartition("|")[0]
+        nodes = [root] + (
+            cmds.listRelatives(root, allDescendents=True, fullPath=True) or []
+        )
+        for node in nodes:
+            path = "|".join(
+                _strip_namespaces(name, job["stripNamespaces"])
+                for name in node[len(parent):].split("|")
+            )
+            if path in written and written[path] != node:
+                problems.append(
+                    _problem(
+                        alembicFile,
+                        "stripNamespaces",
+                        "{0} and {1} would both be written as {2}".format(
+                            written[path], node, path
+                        )
+                    )
+                )
+            written[path] = node
+
+    return problems
+
+
+def _strip_namespaces(name, stripNamespaces):
+    """
+    Strip namespaces off a node name the way AbcExport does.
+
+    Args:
+        name (str): Node name without its path.
+        stripNamespaces (int): See export().
+
+    Returns:
+        str: Name as written.
+    """
+    parts = name.split(":")
+    if stripNamespaces == 0:
+        return parts[-1]
+    return ":".join(parts[min(stripNamespaces, len(parts) - 1):])
+
+
+# Bytes per value of the Alembic plain old data types, by name. Strings count
+# one byte per value.
+_POD_BYTES = {
+    "kBooleanPOD": 1, "kUint8POD": 1, "kInt8POD": 1, "kUint16POD": 2,
+    "kInt16POD": 2, "kUint32POD": 4, "kInt32POD": 4, "kUint64POD": 8,
+    "kInt64POD": 8, "kFloat16POD": 2, "kFloat32POD": 4, "kFloat64POD": 8
+}
+
+# Statistics types of the properties of geometry schemas, by name.
+_GEOM_PROPERTY_TYPES = {
+    "P": "positions",
+    "N": "normals",
+    "uv": "uvs",
+    ".faceIndices": "topology",
+    ".faceCounts": "topology",
+    ".velocities": "velocities",
+    ".selfBnds": "bounds",
+    ".childBnds": "bounds",
+    "visible": "visibility"
+}
+
+
+def archive_stats(alembicFile, path=None):
+    """
+    Report where the samples and bytes of an Alembic archive go.
+
+    Every object is listed with its number of samples, whether it is
+    animated, and the bytes of each property and of each property type:
+    "positions", "normals", "uvs", "colorSets", "faceSets", "topology",
+    "transforms" and so on. Objects are listed largest first.
+
+    Objects are read one at a time and their records spooled to a temporary
+    file, so only their sizes are kept in memory. Bytes are of the sample
+    data before compression and before Ogawa shares repeated samples, so
+    they rank objects rather than add up to the file size.
+
+    Needs PyAlembic.
+
+    Args:
+        alembicFile (str): Alembic file to read.
+        path (str, optional): File location to write the JSON report to.
+            Defaults to "<alembicFile>.stats.json".
+
+    Returns:
+        str: File location of the report.
+    """
+    from alembic import Abc
+
+    path = path or os.path.splitext(alembicFile)[0] + ".stats.json"
+    archive = Abc.IArchive(str(alembicFile))
+
+    types = collections.defaultdict(int)
+    index = []
+    with tempfile.TemporaryFile() as records:
+        objects = [archive.getTop()]
+        while objects:
+            obj = objects.pop()
+            objects.extend(
+                obj.getChild(number)
+                for number in reversed(range(obj.getNumChildren()))
+            )
+            record = _object_stats(obj, Abc)
+            if not record["properties"]:
+                continue
+
+            for key, value in record["types"].items():
+                types[key] += value
+            index.append((record["bytes"], records.tell()))
+            records.write(json.dumps(record).encode("utf-8") + b"\n")
+
+        index.sort(key=lambda item: item[0], reverse=True)
+        with open(path, "w") as f:
+            f.write(
+                "{{\"alembicFile\": {0}, \"bytes\": {1}, \"types\": {2}, "
+                "\"objects\": [".format(
+                    json.dumps(alembicFile),
+                    sum(types.values()),
+                    json.dumps(types, sort_keys=True)
+                )
+            )
+            for number, (size, offset) in enumerate(index):
+                records.seek(offset)
+                f.write("," if number else "")
+                f.write("\n" + records.readline().decode("utf-8").rstrip())
+            f.write("\n]}\n")
+
+    return path
+
+
+def _object_stats(obj, Abc):
+    """
+    Measure the properties of an Alembic object.
+
+    Args:
+        obj (alembic.Abc.IObject): Object to measure.
+        Abc (module): The alembic.Abc module.
+
+    Returns:
+        dict: Record with the "path", "bytes", "samples" and "animated" of
+            the object, its bytes per property type as "types" and its
+            "properties", largest first.
+    """
+    face_set = obj.getMetaData().get("schema").startswith("AbcGeom_FaceSet")
+
+    properties = []
+    compounds = [([], obj.getProperties(), None)]
+    while compounds:
+        parents, compound, inherited = compounds.pop()
+        for number in range(compound.getNumProperties()):
+            header = compound.getPropertyHeader(number)
+            names = parents + [header.getName()]
+            prop = compound.getProperty(header.getName())
+            kind = inherited or (
+                "faceSets" if face_set else _property_type(names, header)
+            )
+            if header.isCompound():
+                compounds.append((names, prop, kind))
+                continue
+
+            data_type = header.getDataType()
+            value_bytes = (
+                _POD_BYTES.get(str(data_type.getPod()), 1) *
+                data_type.getExtent()
+            )
+            samples = prop.getNumSamples()
+            constant = prop.isConstant()
+
+            size = 0
+            for sample in range(min(samples, 1) if constant else samples):
+                if header.isArray():
+                    value = prop.getValue(Abc.ISampleSelector(sample))
+                    size += len(value) * value_bytes
+                else:
+                    size += value_bytes
+
+            properties.append(
+                {
+                    "name": "/".join(names),
+                    "type": kind or "other",
+                    "samples": samples,
+                    "constant": constant,
+                    "bytes": size
+                }
+            )
+
+    types = collections.defaultdict(int)
+    for prop in properties:
+        types[prop["type"]] += prop["bytes"]
+
+    return {
+        "path": obj.getFullName(),
+        "bytes": sum(types.values()),
+        "samples": max([prop["samples"] for prop in properties] or [0]),
+        "animated": not all(prop["constant"] for prop in properties),
+        "types": types,
+        "properties": sorted(
+            properties, key=lambda prop: prop["bytes"], reverse=True
+        )
+    }
+
+
+def _property_type(names, header):
+    """
+    Find the statistics type of a property.
+
+    Args:
+        names (list of str): Names of the property and its parent compound
+            properties.
+        header (alembic.Abc.PropertyHeader): Header of the property.
+
+    Returns:
+        str: Type, or None when it is only known further down a compound.
+    """
+    if names[0] == ".xform":
+        return "transforms"
+    if ".userProperties" in names:
+        return "userProperties"
+
+    if names[-2:-1] == [".arbGeomParams"]:
+        metadata = header.getMetaData()
+        if metadata.get("interpretation") in ("rgb", "rgba"):
+            return "colorSets"
+        if header.isCompound():
+            extent = metadata.get("podExtent")
+        else:
+            extent = str(header.getDataType().getExtent())
+        return "uvs" if extent == "2" else "geomParams"
+
+    if len(names) == 1 or names[-2:-1] == [".geom"]:
+        return _GEOM_PROPERTY_TYPES.get(names[-1])
+    return None
+
+
+class _Profiler(object):
+    """Frame callback recording the wall time of every sampled frame."""
+
+    def __init__(self):
+        self.start = time.time()
+        self.last = self.start
+        self.frames = []
+
+    def __call__(self, frame):
+        now = time.time()
+        self.frames.append({"frame": frame, "seconds": now - self.last})
+        self.last = now
+
+    def write(self, path, alembicFile):
+        """
+        Write the profiling report.
+
+        The time of the first frame includes the preroll and the export
+        setup, as AbcExport does not run the callback before it.
+
+        Args:
+            path (str): File location to write the JSON report to.
+            alembicFile (str): Exported Alembic file.
+        """
+        duration = self.last - self.start
+        report = {
+            "alembicFile": alembicFile,
+            "phases": collections.OrderedDict(_phases),
+            "frameCount": len(self.frames),
+            "framesPerSecond": len(self.frames) / duration if duration else 0,
+            "peakMemory": _peak_memory(),
+            "slowestFrames": sorted(
+                self.frames, key=lambda frame: frame["seconds"], reverse=True
+            )[:10],
+            "frames": self.frames
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+class _Progress(object):
+    """
+    Frame callback streaming progress events as JSON lines.
+
+    The target is either one of export(), or a writer from _open_progress()
+    shared with other reporters, which is left open at the end.
+    """
+
+    def __init__(self, target, alembicFile, frameCount):
+        self.alembicFile = alembicFile
+        self.frameCount = frameCount
+        self.frames = 0
+        self.start = time.time()
+        self._shared = callable(target)
+        self._write = target if self._shared else _open_progress(target)
+        self.emit("start", frameCount=frameCount)
+
+    def __call__(self, frame, bounds=None):
+        self.frames += 1
+        elapsed = time.time() - self.start
+        rate = self.frames / elapsed if elapsed else 0
+        remaining = max(self.frameCount - self.frames, 0)
+        self.emit(
+            "frame",
+            frame=frame,
+            index=self.frames,
+            frameCount=self.frameCount,
+            elapsed=elapsed,
+            framesPerSecond=rate,
+            eta=remaining / rate if rate else None
+        )
+
+    def end(self, status):
+        """
+        Send the end event and close the target.
+
+        Args:
+            status (str): "done", "failed" or "cached".
+        """
+        size = None
+        if os.path.isfile(self.alembicFile):
+            size = os.path.getsize(self.alembicFile)
+        self.emit(
+            "end",
+            status=status,
+            frames=self.frames,
+            elapsed=time.time() - self.start,
+            size=size
+        )
+        if not self._shared:
+            self._write(None)
+
+    def emit(self, event, **data):
+        """
+        Send an event. A target that went away stops receiving events
+        instead of failing the export.
+
+        Args:
+            event (str): Name of the event.
+            **data: Values of the event.
+        """
+        data.update(
+            {"event": event, "alembicFile": self.alembicFile,
+             "time": time.time()}
+        )
+        try:
+            self._write(json.dumps(data, sort_keys=True) + "\n")
+        except (IOError, OSError, socket.error) as e:
+            print("Progress events stopped: {0}".format(e))
+            self._write = lambda line: None
+
+
+def _open_progress(target):
+    """
+    Open the target of progress events, disabling them when it fails.
+
+    Args:
+        target (int or str): Target of progress events, see export().
+
+    Returns:
+        callable: Writer from _progress_writer().
+    """
+    try:
+        return _progress_writer(target)
+    except (IOError, OSError, socket.error) as e:
+        print("Progress events disabled: {0}".format(e))
+        return lambda line: None
+
+
+@contextlib.contextmanager
+def _progress(target, alembicFile, frameCount=0):
+    """
+    Send the start and end events of an export that sends no frame events.
+
+    Args:
+        target (int or str): Target of progress events, see export(). No
+            events are sent when None.
+        alembicFile (str): File location of the export.
+        frameCount (int, optional): Number of frames of the export. Defaults
+            to 0.
+    """
+    if target is None:
+        yield
+        return
+
+    reporter = _Progress(target, alembicFile, frameCount)
+    status = "failed"
+    try:
+        yield
+        status = "done"
+    finally:
+        reporter.end(status)
+
+
+def _progress_fd(target):
+    """
+    Get the file descriptor of a progress target.
+
+    Args:
+        target (int or str): Target of progress events, see export().
+
+    Returns:
+        int: File descriptor, or None when the target is not one.
+    """
+    if isinstance(target, int) or str(target).isdigit():
+        return int(target)
+    return None
+
+
+def _progress_writer(target):
+    """
+    Open the target of progress events.
+
+    Args:
+        target (int or str): File descriptor, "host:port" of a local socket,
+            path of a Unix domain socket or path of a file to append to.
+
+    Returns:
+        callable: Writes a line, or closes the target when passed None.
+    """
+    fd = _progress_fd(target)
+    if fd is not None:
+        def write(line):
+            if line is not None:
+                os.write(fd, line.encode("utf-8"))
+        return write
+
+    address = re.match(r"^([\w.-]*):(\d+)$", target)
+    if address or (os.path.exists(target) and
+                   stat.S_ISSOCK(os.stat(target).st_mode)):
+        if address:
+            connection = socket.create_connection(
+                (address.group(1) or "localhost", int(address.group(2)))
+            )
+        else:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.connect(target)
+
+        def write(line):
+            if line is None:
+                connection.close()
+            else:
+                connection.sendall(line.encode("utf-8"))
+        return write
+
+    f = open(target, "a")
+
+    def write(line):
+        if line is None:
+            f.close()
+        else:
+            f.write(line)
+            f.flush()
+    return write
+
+
+def _peak_memory():
+    """
+    Get the peak resident memory of this process.
+
+    Returns:
+        int: Peak memory in bytes, or None where it is not supported.
+    """
+    if os.name == "nt":
+        counters = _windows_memory_counters()
+        return counters.PeakWorkingSetSize if counters else None
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _memory_usage():
+    """
+    Get the current resident memory of this process.
+
+    macOS has no cheap way to query it, so the peak is used instead.
+
+    Returns:
+        int: Memory in bytes, or None where it is not supported.
+    """
+    if os.name == "nt":
+        counters = _windows_memory_counters()
+        return counters.WorkingSetSize if counters else None
+
+    try:
+        with open("/proc/self/statm") as f:
+            resident = int(f.read().split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError, IndexError):
+        return _peak_memory()
+
+
+def _windows_memory_counters():
+    """
+    Get the memory counters of this process on Windows.
+
+    Returns:
+        ctypes.Structure: PROCESS_MEMORY_COUNTERS, or None on failure.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t)
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb):
+        return None
+
+    return counters
+
+
+def _cacheable(options):
+    """
+    Check whether an export can be fetched from and stored in the cache.
+
+    Split exports write more than one file, which the cache does not hold.
+    Profile and stats reports need the export to run, and callables can not
+    be part of the cache key.
+
+    Args:
+        options (dict): Arguments of export().
+
+    Returns:
+        bool: Whether the cache applies.
+    """
+    return bool(
+        options.get("cacheDir") and
+        options.get("shards", 0) <= 1 and
+        options.get("partitions", 0) <= 1 and
+        not options.get("chunkSize") and
+        not options.get("memoryBudget") and
+        not options.get("splitStatic") and
+        not options.get("profile") and
+        not options.get("stats") and
+        not _split_callables(options.get("pythonPerFrameCallback", ""))[1]
+    )
+
+
+def _cache_key(mayaFile, job, dontSkipUnwrittenFrames, preRollStartFrame):
+    """
+    Compute the export cache key of a job.
+
+    The key covers the contents of the Maya file and the rendered job
+    argument, but not the output location. References are checked separately
+    by _fetch_cache(), as they are only known once the scene is open.
+
+    Args:
+        mayaFile (str): File location of the Maya scene.
+        job (dict): Job arguments of export(), without alembicFile.
+        dontSkipUnwrittenFrames (bool): See export().
+        preRollStartFrame (float): See export().
+
+    Returns:
+        str: Cache key.
+    """
+    data = json.dumps(
+        [
+            _file_hash(mayaFile),
+            _job_arg("", **job),
+            dontSkipUnwrittenFrames,
+            preRollStartFrame
+        ]
+    )
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+# Hashes of files by path, modification time and size.
+_file_hashes = {}
+
+
+def _file_hash(path):
+    """
+    Hash the contents of a file, remembering the result while it is unchanged.
+
+    Args:
+        path (str): File to hash.
+
+    Returns:
+        str: SHA-1 hex digest of the file.
+    """
+    stamp = (os.path.abspath(path),) + tuple(_file_stamp(path))
+    if stamp not in _file_hashes:
+        _file_hashes[stamp] = _file_sha1(path)
+
+    return _file_hashes[stamp]
+
+
+def _file_sha1(path):
+    """
+    Hash the contents of a file.
+
+    Args:
+        path (str): File to hash.
+
+    Returns:
+        str: SHA-1 hex digest of the file.
+    """
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha1.update(chunk)
+
+    return sha1.hexdigest()
+
+
+def _file_stamp(path):
+    """
+    Get the modification time and size of a file.
+
+    Args:
+        path (str): File to stamp.
+
+    Returns:
+        list: Modification time and size, or None if the file is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return [stat.st_mtime, stat.st_size]
+
+
+def _fetch_cache(cacheDir, key, alembicFile):
+    """
+    Link or copy a cached export to the output location.
+
+    Cached exports are read-only. Windows shares the read-only attribute
+    between hard links, so they are copied there to keep outputs removable.
+
+    Args:
+        cacheDir (str): Directory of the export cache.
+        key (str): Cache key from _cache_key().
+        alembicFile (str): File location to write the Alembic data.
+
+    Returns:
+        bool: Whether a valid cached export was found.
+    """
+    entry = os.path.join(cacheDir, key)
+    try:
+        with open(entry + ".json") as f:
+            metadata = json.load(f)
+    except (IOError, ValueError):
+        return False
+
+    for path, stamp in metadata["dependencies"].items():
+        if _file_stamp(path) != stamp:
+            return False
+
+    if os.path.isfile(alembicFile):
+        _remove(alembicFile)
+    try:
+        if os.name == "nt":
+            raise OSError("Hard links share the read-only attribute")
+        os.link(entry + ".abc", alembicFile)
+    except (AttributeError, OSError):
+        shutil.copyfile(entry + ".abc", alembicFile)
+
+    # The metadata file tracks use, as the archive may share its modification
+    # time with hard links.
+    os.utime(entry + ".json", None)
+
+    print("Using cached export: {0}".format(entry + ".abc"))
+    return True
+
+
+def _store_cache(cacheDir, key, alembicFile, cacheSize):
+    """
+    Add an export to the cache and evict the least recently used exports.
+
+    Args:
+        cacheDir (str): Directory of the export cache.
+        key (str): Cache key from _cache_key().
+        alembicFile (str): Exported Alembic file.
+        cacheSize (float): Size limit of the cache in megabytes.
+    """
+    if not os.path.isdir(cacheDir):
+        os.makedirs(cacheDir)
+
+    entry = os.path.join(cacheDir, key)
+    temp_file = "{0}.{1}.tmp".format(entry, os.getpid())
+    shutil.copyfile(alembicFile, temp_file)
+    # Outputs linked to the entry can not be written through.
+    os.chmod(temp_file, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    _replace(temp_file, entry + ".abc")
+
+    dependencies = {}
+    for node in cmds.ls(type="reference"):
+        try:
+            path = cmds.referenceQuery(
+                node, filename=True, withoutCopyNumber=True
+            )
+        except RuntimeError:
+            # Reference nodes without a file, like sharedReferenceNode.
+            continue
+        dependencies[path] = _file_stamp(path)
+
+    # The metadata is written last, so incomplete entries are never used.
+    with open(entry + ".json", "w") as f:
+        json.dump({"dependencies": dependencies}, f, indent=4)
+
+    entries = []
+    for name in os.listdir(cacheDir):
+        if name.endswith(".json"):
+            entry = os.path.join(cacheDir, name[:-len(".json")])
+            entries.append(
+                (
+                    os.path.getmtime(entry + ".json"),
+                    entry,
+                    (_file_stamp(entry + ".abc") or [0, 0])[1]
+                )
+            )
+    entries.sort()
+
+    total = sum(size for used, entry, size in entries)
+    while entries and total > cacheSize * 1024 * 1024:
+        used, entry, size = entries.pop(0)
+        os.remove(entry + ".json")
+        if os.path.exists(entry + ".abc"):
+            _remove(entry + ".abc")
+        total -= size
+
+
+def _export_shards(alembicFile,
+                   job,
+                   shards,
+                   options,
+                   workers=0,
+                   shardPreRoll=None):
+    """
+    Export the frame ranges of a job as shards in parallel mayapy processes.
+
+    Args:
+        alembicFile (str): File location the shard files are named after.
+        job (dict): Job arguments of export().
+        shards (int): Number of shards to split the frame ranges into.
+        options (dict): Other arguments of export() for every shard, like
+            "preRollStartFrame" or "profile".
+        workers (int, optional): See export().
+        shardPreRoll (float, optional): See export().
+    """
+    mayaFile = cmds.file(query=True, sceneName=True)
+    if not mayaFile:
+        raise RuntimeError("Sharded export needs the scene saved to disk.")
+    if not job["frameRange"]:
+        raise ValueError("Sharded export needs a frameRange.")
+
+    name, ext = os.path.splitext(alembicFile)
+    shard_specs = [
+        _piece_spec(
+            job,
+            options,
+            "{0}.shard{1:04d}{2}".format(name, number, ext),
+            shardPreRoll,
+            frameRange=frameRange
+        )
+        for number, frameRange in enumerate(
+            _split_frame_ranges(job["frameRange"], shards, job["step"])
+        )
+    ]
+    index = {
+        "frameRange": job["frameRange"],
+        "shards": [
+            {"alembicFile": spec["alembicFile"],
+             "frameRange": spec["frameRange"]}
+            for spec in shard_specs
+        ]
+    }
+    _run_pieces(mayaFile, alembicFile, "shards", shard_specs, index, workers)
+
+
+def _export_partitions(alembicFile, job, partitions, options, workers=0):
+    """
+    Export groups of the roots of a job in parallel mayapy processes.
+
+    Args:
+        alembicFile (str): File location the partition files are named after.
+        job (dict): Job arguments of export().
+        partitions (int): Maximum number of archives to split the roots into.
+        options (dict): Other arguments of export() for every partition, like
+            "preRollStartFrame" or "profile".
+        workers (int, optional): See export().
+    """
+    mayaFile = cmds.file(query=True, sceneName=True)
+    if not mayaFile:
+        raise RuntimeError("Partitioned export needs the scene saved to disk.")
+
+    if not job["root"]:
+        raise ValueError("Partitioned export needs roots.")
+    groups = _partition_roots(job["root"], partitions)
+
+    name, ext = os.path.splitext(alembicFile)
+    partition_specs = [
+        _piece_spec(
+            job,
+            options,
+            "{0}.partition{1:04d}{2}".format(name, number, ext),
+            root=group
+        )
+        for number, group in enumerate(groups)
+    ]
+    index = {"roots": collections.OrderedDict(), "partitions": []}
+    for spec in partition_specs:
+        index["partitions"].append(
+            {"alembicFile": spec["alembicFile"], "root": spec["root"]}
+        )
+        for root in spec["root"]:
+            index["roots"][root] = spec["alembicFile"]
+
+    # Each process only loads the references of its roots.
+    _run_pieces(
+        mayaFile,
+        alembicFile,
+        "partitions",
+        partition_specs,
+        index,
+        workers,
+        selectiveReferences=True
+    )
+
+
+def _piece_spec(job, options, alembicFile, shardPreRoll=None, **changes):
+    """
+    Build the arguments of export() for one piece of a split export.
+
+    Reports are written next to each piece. A piece starting after the first
+    frame of the job evaluates run-up before its first frame, by default as
+    much as the job evaluates before its own first frame.
+
+    Args:
+        job (dict): Job arguments of export().
+        options (dict): Other arguments of export() for every piece.
+        alembicFile (str): File location of the piece.
+        shardPreRoll (float, optional): See export().
+        **changes: Job arguments of the piece, like "frameRange" or "root".
+
+    Returns:
+        dict: Arguments of export().
+    """
+    spec = dict(job)
+    spec.update(options)
+    spec.update(changes)
+    spec["alembicFile"] = alembicFile
+    spec["profile"] = bool(spec.get("profile"))
+    spec["stats"] = bool(spec.get("stats"))
+
+    start = spec["frameRange"][0][0] if spec["frameRange"] else None
+    if job["frameRange"] and start != job["frameRange"][0][0]:
+        if shardPreRoll is None:
+            first = job["frameRange"][0][0]
+            shardPreRoll = 0.0
+            if 0 < options["preRollStartFrame"] < first:
+                shardPreRoll = first - options["preRollStartFrame"]
+        spec["preRollStartFrame"] = start - shardPreRoll
+    return spec
+
+
+def _run_pieces(mayaFile,
+                alembicFile,
+                kind,
+                specs,
+                index,
+                workers=0,
+                selectiveReferences=False):
+    """
+    Export pieces in parallel mayapy processes and write their index.
+
+    Args:
+        mayaFile (str): File location of the Maya scene to open.
+        alembicFile (str): File location the index is named after.
+        kind (str): Plural name of the pieces, like "shards", used for
+            messages and the "<alembicFile>.<kind>.json" index.
+        specs (list of dict): Arguments of export() for each piece.
+        index (dict): Index to write once every piece is exported.
+        workers (int, optional): See export().
+        selectiveReferences (bool, optional): See _export_command().
+    """
+    temp_dir = tempfile.mkdtemp()
+    try:
+        commands = [
+            _export_command(
+                mayaFile,
+                [spec],
+                temp_dir,
+                number,
+                selectiveReferences=selectiveReferences
+            )
+            for number, spec in enumerate(specs)
+        ]
+        print("Exporting {0} {1} of {2}".format(len(commands), kind, mayaFile))
+        exit_codes = _run_processes(commands, workers=workers)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    failed = [
+        spec["alembicFile"] for spec, code in zip(specs, exit_codes) if code
+    ]
+    if failed:
+        raise RuntimeError(
+            "Failed to export {0}: {1}".format(kind, ", ".join(failed))
+        )
+
+    with open("{0}.{1}.json".format(os.path.splitext(alembicFile)[0], kind),
+              "w") as f:
+        json.dump(index, f, indent=4)
+
+
+def _partition_roots(roots, partitions):
+    """
+    Group roots into balanced partitions, keeping roots of a rig together.
+
+    Roots belong to the same rig when their nodes share a namespace. Rigs are
+    assigned largest first to the partition with the fewest nodes so far.
+
+    Args:
+        roots (list of str): Roots to partition.
+        partitions (int): Maximum number of partitions.
+
+    Returns:
+        list of list of str: Roots of each partition, in the order given.
+    """
+    rigs = collections.OrderedDict()
+    for root in roots:
+        namespace = root.split("|")[-1].rpartition(":")[0]
+        rigs.setdefault(namespace or root, []).append(root)
+
+    sizes = {}
+    for rig, rig_roots in rigs.items():
+        sizes[rig] = len(rig_roots) + len(
+            cmds.listRelatives(rig_roots, allDescendents=True) or []
+        )
+
+    count = min(partitions, len(rigs))
+    groups = [[] for _ in range(count)]
+    weights = [0] * count
+    for rig in sorted(rigs, key=lambda rig: sizes[rig], reverse=True):
+        lightest = weights.index(min(weights))
+        groups[lightest].extend(rigs[rig])
+        weights[lightest] += sizes[rig]
+
+    order = dict((root, number) for number, root in enumerate(roots))
+    return [sorted(group, key=order.get) for group in groups if group]
+
+
+def _export_chunks(alembicFile, job, chunkSize, options, shardPreRoll=None):
+    """
+    Export the frame ranges of a job as chunks, resuming from a checkpoint.
+
+    Args:
+        alembicFile (str): File location the chunk files are named after.
+        job (dict): Job arguments of export().
+        chunkSize (float): Number of frames per chunk.
+        options (dict): Other arguments of export() for every chunk, like
+            "preRollStartFrame" or "profile".
+        shardPreRoll (float, optional): See export().
+    """
+    if not job["frameRange"]:
+        raise ValueError("Chunked export needs a frameRange.")
+
+    name, ext = os.path.splitext(alembicFile)
+    checkpoint_file = name + ".checkpoint.json"
+
+    # Chunks of an export with other arguments can not be reused. Python
+    # callables are left out, as they can not be serialized.
+    code = _split_callables(job["pythonPerFrameCallback"])[0]
+    key = hashlib.sha1(
+        json.dumps(
+            [
+                dict(job, pythonPerFrameCallback=code),
+                options["preRollStartFrame"],
+                chunkSize,
+                shardPreRoll
+            ],
+            sort_keys=True
+        ).encode("utf-8")
+    ).hexdigest()
+
+    done = []
+    try:
+        with open(checkpoint_file) as f:
+            checkpoint = json.load(f)
+        if checkpoint["key"] == key:
+            done = checkpoint["done"]
+    except (IOError, ValueError):
+        pass
+
+    total = sum(end - start for start, end in job["frameRange"])
+    count = max(int(math.ceil(total / float(chunkSize))), 1)
+    index = {"frameRange": job["frameRange"], "chunks": []}
+    for number, frameRange in enumerate(
+            _split_frame_ranges(job["frameRange"], count, job["step"])):
+        chunk = _piece_spec(
+            job,
+            options,
+            "{0}.chunk{1:04d}{2}".format(name, number, ext),
+            shardPreRoll,
+            frameRange=frameRange
+        )
+
+        index["chunks"].append(
+            {"alembicFile": chunk["alembicFile"], "frameRange": frameRange}
+        )
+
+        chunk_name = os.path.basename(chunk["alembicFile"])
+        if chunk_name in done and os.path.exists(chunk["alembicFile"]):
+            print("Skipping finished chunk: {0}".format(chunk_name))
+            continue
+
+        export(**chunk)
+
+        done.append(chunk_name)
+        temp_file = "{0}.{1}.tmp".format(checkpoint_file, os.getpid())
+        with open(temp_file, "w") as f:
+            json.dump({"key": key, "done": done}, f, indent=4)
+        _replace(temp_file, checkpoint_file)
+
+    with open(name + ".chunks.json", "w") as f:
+        json.dump(index, f, indent=4)
+
+
+# Environment variable with the memory limit in bytes of an export process
+# started by _export_within_budget().
+_MEMORY_LIMIT_VARIABLE = "ALEMBIC_EXPORT_MEMORY_LIMIT"
+
+# Environment variable with the file an export process stopped at its
+# memory limit writes the frame it stopped at to.
+_MEMORY_REPORT_VARIABLE = "ALEMBIC_EXPORT_MEMORY_REPORT"
+
+# Exit code of an export process that stopped at its memory limit.
+_MEMORY_EXIT_CODE = 75
+
+
+def _export_within_budget(alembicFile,
+                          job,
+                          memoryBudget,
+                          options,
+                          shardPreRoll=None):
+    """
+    Export a job in separate mayapy processes, splitting its frame ranges
+    whenever a process runs out of its memory budget.
+
+    The frame ranges are split at the frame the process stopped at, which
+    fit in the budget up to there, or in half when it is unknown.
+
+    Args:
+        alembicFile (str): File location to write the Alembic data.
+        job (dict): Job arguments of export().
+        memoryBudget (float): Memory budget in megabytes.
+        options (dict): Other arguments of export() for every process, like
+            "preRollStartFrame" or "profile".
+        shardPreRoll (float, optional): See export().
+    """
+    mayaFile = cmds.file(query=True, sceneName=True)
+    if not mayaFile:
+        raise RuntimeError("Memory budgeted export needs the scene saved.")
+    if not job["frameRange"]:
+        raise ValueError("Memory budgeted export needs a frameRange.")
+
+    env = dict(os.environ)
+    env[_MEMORY_LIMIT_VARIABLE] = str(int(memoryBudget * 0.9 * 1024 * 1024))
+
+    name, ext = os.path.splitext(alembicFile)
+    pending = [job["frameRange"]]
+    parts = []
+    attempt = 0
+    temp_dir = tempfile.mkdtemp()
+    try:
+        while pending:
+            frameRange = pending.pop(0)
+            attempt += 1
+            part = _piece_spec(
+                job,
+                options,
+                "{0}.attempt{1}{2}".format(name, attempt, ext),
+                shardPreRoll,
+                frameRange=frameRange
+            )
+            # Statistics are read once the parts have their final names.
+            part["stats"] = None
+
+            command = _export_command(mayaFile, [part], temp_dir, attempt)
+            report = os.path.join(temp_dir, "{0}.memory.json".format(attempt))
+            env[_MEMORY_REPORT_VARIABLE] = report
+            exit_code = subprocess.call(command, env=env)
+
+            if exit_code == _MEMORY_EXIT_CODE:
+                if os.path.exists(part["alembicFile"]):
+                    os.remove(part["alembicFile"])
+                try:
+                    with open(report) as f:
+                        frame = json.load(f)["frame"]
+                    pieces = _cut_frame_ranges(frameRange, frame, job["step"])
+                except (IOError, ValueError, KeyError):
+                    frame = None
+                    pieces = _split_frame_ranges(frameRange, 2, job["step"])
+                if len(pieces) < 2:
+                    raise MemoryError(
+                        "Frame range {0} does not fit in {1} MB".format(
+                            frameRange, memoryBudget
+                        )
+                    )
+                print(
+                    "Memory budget reached at frame {0}, splitting {1} into "
+                    "{2}".format(frame, frameRange, pieces)
+                )
+                pending = pieces + pending
+            elif exit_code:
+                raise RuntimeError(
+                    "Failed to export {0}".format(part["alembicFile"])
+                )
+            else:
+                parts.append(
+                    {
+                        "alembicFile": part["alembicFile"],
+                        "frameRange": frameRange
+                    }
+                )
+    finally:
+        shutil.rmtree(temp_dir)
+
+    if len(parts) == 1:
+        _replace(parts[0]["alembicFile"], alembicFile)
+        if options.get("stats"):
+            archive_stats(
+                alembicFile,
+                None if options["stats"] is True else options["stats"]
+            )
+        return
+
+    # Number the parts in frame order.
+    for number, part in enumerate(parts):
+        path = "{0}.part{1:04d}{2}".format(name, number, ext)
+        _replace(part["alembicFile"], path)
+        part["alembicFile"] = path
+        if options.get("stats"):
+            archive_stats(path)
+
+    with open(name + ".parts.json", "w") as f:
+        json.dump(
+            {"frameRange": job["frameRange"], "parts": parts}, f, indent=4
+        )
+
+
+class _MemoryWatchdog(object):
+    """
+    Frame callback stopping the process when it exceeds a memory limit.
+
+    The frame it stopped at is written as JSON to the report file, if any.
+    """
+
+    def __init__(self, limit, report=None):
+        self.limit = limit
+        self.report = report
+
+    def __call__(self, frame):
+        usage = _memory_usage()
+        if usage and usage > self.limit:
+            print(
+                "Stopping at frame {0}, using {1} of {2} bytes".format(
+                    frame, usage, self.limit
+                )
+            )
+            sys.stdout.flush()
+            if self.report:
+                with open(self.report, "w") as f:
+                    json.dump({"frame": frame}, f)
+            # Exiting skips the cleanup of _scratch().
+            for path in list(_scratch_files):
+                if os.path.exists(path):
+                    os.remove(path)
+            # AbcExport can not be interrupted from a callback, and the
+            # unfinished archive is discarded anyway.
+            os._exit(_MEMORY_EXIT_CODE)
+
+
+def _cut_frame_ranges(frameRange, frame, step=1.0):
+    """
+    Split frame ranges in two at a frame.
+
+    The frame ranges are cut on the last sample up to the frame, which
+    starts the second part. Unlike shards, the parts share no sample.
+
+    Args:
+        frameRange (list of list of two floats): Frame ranges to split.
+        frame (float): Frame to cut at.
+        step (float, optional): Time interval between samples. Defaults to
+            1.0.
+
+    Returns:
+        list of list of list of two floats: Frame ranges of the samples
+            before the cut and of the rest. The first part is left out when
+            the frame is on or before the first sample.
+    """
+    samples = _sample_times(frameRange, step)
+    cut = max([time for time in samples if time <= frame + 1e-6] or
+              samples[:1])
+
+    before, after = [], []
+    for start, end in frameRange:
+        length = int(math.floor((end - start) / float(step) + 1e-6))
+        # Index of the first sample of the range from the cut on.
+        first = max(int(math.ceil((cut - start) / float(step) - 1e-6)), 0)
+        if first > length:
+            before.append([start, end])
+        elif first == 0:
+            after.append([start, end])
+        else:
+            before.append([start, start + (first - 1) * step])
+            after.append([start + first * step, end])
+
+    pieces = [piece for piece in (before, after) if piece]
+    sampled = set()
+    for piece in pieces:
+        sampled.update(_sample_times(piece, step))
+    if sorted(sampled) != samples:
+        raise RuntimeError(
+            "Cutting {0} at {1} changes its samples".format(frameRange, frame)
+        )
+    return pieces
+
+
+def _split_frame_ranges(frameRange, count, step=1.0):
+    """
+    Split frame ranges into consecutive shards of about equal length.
+
+    Shards are cut on the samples of each frame range, and neighbouring
+    shards share the sample they are cut on, so no sample in between is lost.
+
+    Args:
+        frameRange (list of list of two floats): Frame ranges to split.
+        count (int): Number of shards.
+        step (float, optional): Time interval between samples. Defaults to
+            1.0.
+
+    Returns:
+        list of list of list of two floats: Frame ranges of each shard. Empty
+            shards are left out.
+    """
+    # Lengths are counted in steps, up to the last sample of each range.
+    lengths = [
+        int(math.floor((end - start) / float(step) + 1e-6))
+        for start, end in frameRange
+    ]
+    total = sum(lengths)
+    bounds = [
+        int(round(total * index / float(count))) for index in range(count)
+    ]
+    bounds.append(total)
+
+    shards = [[] for index in range(count)]
+    offset = 0
+    for (start, end), length in zip(frameRange, lengths):
+        for index in range(count):
+            low = max(bounds[index], offset)
+            high = min(bounds[index + 1], offset + length)
+            if high > low or (length == 0 and low == high == offset):
+                shards[index].append([
+                    start + (low - offset) * step,
+                    end if high == offset + length
+                    else start + (high - offset) * step
+                ])
+                if length == 0:
+                    break
+        offset += length
+
+    shards = [shard for shard in shards if shard]
+    sampled = set()
+    for shard in shards:
+        sampled.update(_sample_times(shard, step))
+    if sorted(sampled) != _sample_times(frameRange, step):
+        raise RuntimeError(
+            "Splitting {0} with step {1} changes its samples".format(
+                frameRange, step
+            )
+        )
+    return shards
+
+
+def _export_command(mayaFile, jobs, directory, name,
+                    selectiveReferences=False):
+    """
+    Build the command to export jobs in a separate mayapy process.
+
+    Args:
+        mayaFile (str): File location of the Maya scene to open.
+        jobs (list of dict): Jobs for -jobFile. A single job may use any
+            argument of export().
+        directory (str): Directory to write the job file to.
+        name (str or int): Name of the job file, unique in the directory.
+        selectiveReferences (bool, optional): Only load the references needed
+            for the roots of the jobs. Defaults to False.
+
+    Returns:
+        list of str: Command line arguments.
+    """
+    job_file = os.path.join(directory, "{0}.json".format(name))
+    with open(job_file, "w") as f:
+        json.dump(jobs, f)
+
+    # Run the source rather than a compiled file next to it.
+    script = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+
+    command = [
+        _mayapy(), script, "-mayaFile", mayaFile, "-jobFile", job_file
+    ]
+    if selectiveReferences:
+        command.append("-selectiveReferences")
+    return command
+
+
+def _mayapy():
+    """
+    Find the mayapy executable to run separate export processes with.
+
+    The MAYAPY environment variable takes precedence, then the mayapy of
+    MAYA_LOCATION, then the running interpreter.
+
+    Returns:
+        str: Path to mayapy.
+    """
+    if os.environ.get("MAYAPY"):
+        return os.environ["MAYAPY"]
+
+    if os.environ.get("MAYA_LOCATION"):
+        executable = "mayapy.exe" if os.name == "nt" else "mayapy"
+        return os.path.join(os.environ["MAYA_LOCATION"], "bin", executable)
+
+    return sys.executable
+
+
+def _run_processes(commands, workers=0):
+    """
+    Run commands as subprocesses, a limited number at a time.
+
+    Args:
+        commands (list of list of str): Commands to run.
+        workers (int, optional): Number of commands to run at once. Defaults
+            to 0, which means the number of cores.
+
+    Returns:
+        list of int: Exit code of each command.
+    """
+    pool = ThreadPool(workers or multiprocessing.cpu_count())
+    try:
+        return pool.map(subprocess.call, commands)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _argument_names(function):
+    """
+    Get the names of the arguments of a function.
+
+    Args:
+        function (function): Function to inspect.
+
+    Returns:
+        list of str: Argument names.
+    """
+    code = function.__code__
+    return list(code.co_varnames[:code.co_argcount])
+
+
+# Assumed write throughput of AbcExport in bytes per second, for plan().
+_WRITE_BYTES_PER_SECOND = 100 * 1024 * 1024
+
+
+def plan(calibrationFrames=3, taskSeconds=600, **kwargs):
+    """
+    Estimate the size and duration of an export without exporting.
+
+    The objects the export would write are resolved from the roots,
+    selection and renderableOnly, and their vertices and face varying values
+    counted. Static roots, see splitStatic of export(), are counted once. The
+    time per sample is measured by evaluating a few sample times. The job is
+    checked against the scene first, like in export().
+
+    Args:
+        calibrationFrames (int, optional): Number of sample times to evaluate
+            for measuring the time per sample. Defaults to 3.
+        taskSeconds (float, optional): Preferred duration of a farm task,
+            used to recommend a number of shards. Defaults to 600.
+        **kwargs: Arguments of export(). alembicFile is optional.
+
+    Returns:
+        dict: Plan with the counts of "objects", "meshes", "vertices",
+            "faceVaryingValues" and "samples", the "estimatedBytes",
+            "secondsPerSample", "estimatedSeconds" and "recommendedShards".
+    """
+    _initialize()
+
+    # Unknown arguments fail as they would for export().
+    export_args = _argument_names(export)
+    unknown = sorted(set(kwargs) - set(export_args))
+    if unknown:
+        raise TypeError(
+            "plan() got unexpected keyword arguments: {0}".format(
+                ", ".join(unknown)
+            )
+        )
+
+    options = dict(zip(export_args[1:], export.__defaults__))
+    options.update(kwargs)
+
+    problems = (
+        _check_job(options, alembicFile=options.get("alembicFile")) +
+        _check_scene(options, alembicFile=options.get("alembicFile"))
+    )
+    if problems:
+        raise ValidationError(problems)
+
+    roots = cmds.ls(options["root"], long=True)
+    if not options["root"]:
+        roots = cmds.ls(assemblies=True, long=True)
+
+    nodes = _planned_nodes(
+        roots, options["selection"], options["renderableOnly"]
+    )
+    animated = _animated_roots(roots, options["worldSpace"])
+    times = _sample_times(
+        options["frameRange"], options["step"], options["frameRelativeSample"]
+    )
+    if not times:
+        times = [cmds.currentTime(query=True)]
+
+    normals = 0 if options["noNormals"] else 1
+    counts = {"objects": len(nodes), "meshes": 0, "vertices": 0,
+              "faceVaryingValues": 0}
+    estimated_bytes = 0
+    for node in nodes:
+        samples = 1
+        if any(node == root or node.startswith(root + "|")
+               for root in animated):
+            samples = len(times)
+        if cmds.nodeType(node) != "mesh":
+            # Transforms and other objects.
+            estimated_bytes += 128 * samples
+            continue
+
+        mesh = _mesh_counts(node)
+        uv_sets = 1 if options["uvWrite"] else 0
+        if options["writeUVSets"]:
+            uv_sets += max(mesh["uvSets"] - 1, 0)
+        color_sets = mesh["colorSets"] if options["writeColorSets"] else 0
+
+        counts["meshes"] += 1
+        counts["vertices"] += mesh["vertices"]
+        counts["faceVaryingValues"] += mesh["faceVertices"] * (
+            normals + uv_sets + color_sets
+        )
+
+        # Topology, uvs and colors are written once, points and normals
+        # every sample.
+        estimated_bytes += 4 * (mesh["faces"] + mesh["faceVertices"])
+        estimated_bytes += 12 * mesh["vertices"] * samples
+        estimated_bytes += 12 * mesh["faceVertices"] * normals * samples
+        estimated_bytes += 8 * mesh["faceVertices"] * uv_sets
+        estimated_bytes += 16 * mesh["faceVertices"] * color_sets
+
+    # Measure evaluation by moving through a few of the sample times.
+    current = cmds.currentTime(query=True)
+    step = max(len(times) // max(calibrationFrames, 1), 1)
+    calibration = times[::step][:calibrationFrames]
+    start = time.time()
+    try:
+        for sample in calibration:
+            cmds.currentTime(sample, update=True)
+            if roots:
+                cmds.exactWorldBoundingBox(roots)
+    finally:
+        cmds.currentTime(current, update=False)
+    seconds_per_sample = (time.time() - start) / max(len(calibration), 1)
+
+    preroll = 0
+    if 0 < options["preRollStartFrame"] < times[0]:
+        preroll = int(times[0] - options["preRollStartFrame"])
+
+    estimated_seconds = (
+        seconds_per_sample * (len(times) + preroll) +
+        estimated_bytes / float(_WRITE_BYTES_PER_SECOND)
+    )
+    shards = int(math.ceil(estimated_seconds / float(taskSeconds)))
+
+    report = dict(counts)
+    report.update(
+        {
+            "samples": len(times),
+            "prerollFrames": preroll,
+            "animatedRoots": animated,
+            "estimatedBytes": estimated_bytes,
+            "secondsPerSample": seconds_per_sample,
+            "estimatedSeconds": estimated_seconds,
+            "recommendedShards": max(
+                min(shards, multiprocessing.cpu_count(), len(times)), 1
+            )
+        }
+    )
+    return report
+
+
+def _planned_nodes(roots, selection=False, renderableOnly=False):
+    """
+    Resolve the dag nodes an export would write.
+
+    Args:
+        roots (list of str): Long names of the roots.
+        selection (bool, optional): Only selected nodes and their descendants
+            under the roots. Defaults to False.
+        renderableOnly (bool, optional): Leave out hidden, templated and
+            intermediate nodes and their descendants. Defaults to False.
+
+    Returns:
+        list of str: Long names of the nodes.
+    """
+    if not roots:
+        return []
+
+    nodes = list(roots)
+    nodes += cmds.listRelatives(
+        roots, allDescendents=True, fullPath=True
+    ) or []
+    nodes = sorted(set(nodes))
+
+    if selection:
+        selected = cmds.ls(selection=True, long=True)
+        nodes = [
+            node for node in nodes
+            if any(node == path or node.startswith(path + "|")
+                   for path in selected)
+        ]
+
+    if renderableOnly:
+        hidden = []
+        renderable = []
+        for node in nodes:
+            if any(node.startswith(path + "|") for path in hidden):
+                continue
+            if (not cmds.getAttr(node + ".visibility") or
+                    cmds.getAttr(node + ".template") or
+                    cmds.getAttr(node + ".intermediateObject")):
+                hidden.append(node)
+                continue
+            renderable.append(node)
+        nodes = renderable
+
+    return nodes
+
+
+def _mesh_counts(mesh):
+    """
+    Count the components of a mesh.
+
+    Args:
+        mesh (str): Long name of the mesh shape.
+
+    Returns:
+        dict: Number of "vertices", "faces", "faceVertices", "uvSets" and
+            "colorSets".
+    """
+    from maya.api import OpenMaya
+
+    selection = OpenMaya.MSelectionList()
+    selection.add(mesh)
+    fn = OpenMaya.MFnMesh(selection.getDagPath(0))
+    return {
+        "vertices": fn.numVertices,
+        "faces": fn.numPolygons,
+        "faceVertices": fn.numFaceVertices,
+        "uvSets": fn.numUVSets,
+        "colorSets": fn.numColorSets
+    }
+
+
+def _sample_times(frameRange, step=1.0, frameRelativeSample=[]):
+    """
+    List the times AbcExport samples for frame ranges.
+
+    Args:
+        frameRange (list of list of two floats): Frame ranges to sample.
+        step (float, optional): Time interval between samples. Defaults to
+            1.0.
+        frameRelativeSample (list of float, optional): Samples around each
+            step, replacing the sample on the step itself. Defaults to [].
+
+    Returns:
+        list of float: Sorted sample times.
+    """
+    # AbcExport only samples on the step when no relative samples are given.
+    offsets = set(frameRelativeSample or [0.0])
+    times = set()
+    for start, end in frameRange:
+        count = int(math.floor((end - start) / float(step) + 1e-6))
+        for index in range(count + 1):
+            for offset in offsets:
+                times.add(round(start + index * step + offset, 6))
+
+    return sorted(times)
+
+
+def export_jobs(jobs,
+                dontSkipUnwrittenFrames=False,
+                verbose=False,
+                preRollStartFrame=0,
+                prune=False,
+                restorePruned=True,
+                evaluationMode=None,
+                threadCount=None,
+                cachedPlayback=None,
+                gpuOverride=None,
+                scratchDir=None,
+                checksum=False,
+                progress=None):
+    """
+    Export multiple Alembic files in a single scene evaluation pass.
+
+    Every job is written by the same AbcExport call, so the timeline and its
+    preroll are only evaluated once no matter how many files are written.
+    The jobs are checked up front like in export().
+
+    Args:
+        jobs (list of dict): Jobs to export. Each job has an "alembicFile" key
+            and optionally any of the job arguments of export(), like "root",
+            "frameRange" or "uvWrite".
+        dontSkipUnwrittenFrames (bool, optional): When evaluating multiple
+            translate jobs, this decides whether to evaluate frames between
+            jobs when there is a gap in their frame ranges. Defaults to False.
+        verbose (bool, optional): Prints the current frame that is being
+            evaluated. Defaults to False.
+        preRollStartFrame (float, optional): The frame to start scene
+            evaluation at. Defaults to 0.
+        prune (bool, optional): Disable the evaluated nodes that are not
+            upstream of the roots of any job, see export(). Defaults to False.
+        restorePruned (bool, optional): Enable the nodes disabled by prune
+            again after the export. Defaults to True.
+        evaluationMode (str, optional): See export().
+        threadCount (int, optional): See export().
+        cachedPlayback (bool, optional): See export().
+        gpuOverride (bool, optional): See export().
+        scratchDir (str, optional): See export().
+        checksum (bool, optional): See export().
+        progress (int or str, optional): Where to stream progress events to,
+            see export(). Every job sends its own events for its
+            "alembicFile". Defaults to None.
+    """
+    _initialize()
+
+    job_args = _argument_names(_job_arg)
+    defaults = dict(zip(job_args[1:], _job_arg.__defaults__))
+    problems = _check_outputs_unique(jobs)
+    specs = []
+    for job in jobs:
+        spec = dict(defaults)
+        spec.update(job)
+        specs.append(spec)
+        problems += _check_output(job.get("alembicFile"))
+        problems += _check_job(spec, alembicFile=job.get("alembicFile"))
+        problems += _check_scene(spec, alembicFile=job.get("alembicFile"))
+    if problems:
+        raise ValidationError(problems)
+
+    # Each job reports the frames it samples through its own callback, and
+    # the reporters share one connection to the target.
+    reporters = []
+    if progress is not None:
+        write = _open_progress(progress)
+        jobs = [dict(job) for job in jobs]
+        for job, spec in zip(jobs, specs):
+            reporter = _Progress(
+                write,
+                job["alembicFile"],
+                len(
+                    _sample_times(
+                        spec["frameRange"],
+                        spec["step"],
+                        spec["frameRelativeSample"]
+                    )
+                ) or 1
+            )
+            reporters.append(reporter)
+            callback = job.get("pythonPerFrameCallback") or []
+            if not isinstance(callback, list):
+                callback = [callback]
+            job["pythonPerFrameCallback"] = callback + [reporter]
+
+    roots = []
+    for job in jobs:
+        if not job.get("root"):
+            roots = None
+            break
+        roots.extend(job["root"])
+
+    status = "failed"
+    try:
+        with _pruned(roots if prune else None, restore=restorePruned), \
+                _evaluation_settings(
+                    evaluationMode=evaluationMode,
+                    threadCount=threadCount,
+                    cachedPlayback=cachedPlayback,
+                    gpuOverride=gpuOverride), \
+                _scratch(jobs, scratchDir, checksum=checksum) as jobs:
+            _abc_export(
+                jobs,
+                dontSkipUnwrittenFrames=dontSkipUnwrittenFrames,
+                verbose=verbose,
+                preRollStartFrame=preRollStartFrame
+            )
+        status = "done"
+    finally:
+        for reporter in reporters:
+            reporter.end(status)
+        if reporters:
+            write(None)
+
+
+def batch(exports, results=None):
+    """
+    Export many Alembic files across many Maya scenes in one process.
+
+    Exports are grouped by their Maya scene, so each scene is opened only
+    once, and the exports of a scene run one after another. A failing export
+    does not stop the batch, and exports without a "mayaFile" are recorded
+    as failed before any scene is opened.
+
+    When every export of a scene has "selectiveReferences" set to True and
+    exports specific roots, the scene is opened with only the references
+    that contain or feed those roots loaded.
+
+    Args:
+        exports (list of dict): Exports to run. Each export has a "mayaFile",
+            an "alembicFile" and optionally "selectiveReferences" and any of
+            the arguments of export().
+        results (str, optional): File location to write the result records
+            to as JSON. The file is updated after every export, so it also
+            shows the progress of the batch.
+
+    Returns:
+        list of dict: Result record per export in the order they ran, with
+            "mayaFile", "alembicFile", "status" ("done" or "failed"),
+            "duration" in seconds, "size" of the output in bytes and "error"
+            if it failed.
+    """
+    _initialize()
+
+    # Exports without a scene fail on their own, without stopping the batch.
+    records = []
+    scenes = collections.OrderedDict()
+    for job in exports:
+        job = dict(job)
+        mayaFile = job.pop("mayaFile", None)
+        if mayaFile:
+            scenes.setdefault(mayaFile, []).append(job)
+            continue
+        records.append(
+            {
+                "mayaFile": mayaFile,
+                "alembicFile": job.get("alembicFile"),
+                "status": "failed",
+                "duration": 0.0,
+                "size": 0,
+                "error": "Export has no mayaFile."
+            }
+        )
+        print("Skipping export without mayaFile: {0}".format(job))
+    if records and results:
+        with open(results, "w") as f:
+            json.dump(records, f, indent=4)
+
+    for mayaFile, jobs in scenes.items():
+        roots = []
+        for job in jobs:
+            selective = job.pop("selectiveReferences", False)
+            if not selective or not job.get("root"):
+                roots = None
+            elif roots is not None:
+                roots.extend(job["root"])
+
+        open_error = None
+        try:
+            _open_scene(mayaFile, roots=roots)
+        except Exception:
+            open_error = traceback.format_exc()
+            print(open_error)
+
+        for job in jobs:
+            record = {
+                "mayaFile": mayaFile,
+                "alembicFile": job.get("alembicFile"),
+                "status": "failed",
+                "duration": 0.0,
+                "size": 0
+            }
+            records.append(record)
+
+            if open_error:
+                record["error"] = open_error
+            else:
+                start = time.time()
+                try:
+                    export(**job)
+                    # Split exports write an index instead of alembicFile.
+                    if os.path.isfile(job["alembicFile"]):
+                        record["size"] = os.path.getsize(job["alembicFile"])
+                except Exception:
+                    record["error"] = traceback.format_exc()
+                    print(record["error"])
+                else:
+                    record["status"] = "done"
+                record["duration"] = time.time() - start
+
+            if results:
+                with open(results, "w") as f:
+                    json.dump(records, f, indent=4)
+
+    return records
+
+
+def worker(spoolDir, maxJobs=0, pollInterval=1.0):
+    """
+    Process export jobs from a spool directory.
+
+    Maya and the AbcExport plugin are initialized once, and the scene is reset
+    between jobs. Jobs are JSON files ending in ".json", processed in name
+    order. Submitters should write a job under another name and rename it to
+    ".json" when complete, so a worker never reads a partial file.
+
+    A job is claimed by renaming it to "<job>.running", which is safe with
+    several workers on the same directory. When finished, it is renamed to
+    "<job>.done" or "<job>.failed", and a result record is written to
+    "<job>.result".
+
+    Each job is an object with a "mayaFile" and either the arguments of
+    export(), for example:
+
+        {"mayaFile": "shot.mb", "alembicFile": "char.abc", "root": ["|char"]}
+
+    or a "jobs" list and the evaluation arguments of export_jobs():
+
+        {"mayaFile": "shot.mb", "jobs": [{"alembicFile": "char.abc"}]}
+
+    With "selectiveReferences" set to True, only the references that contain
+    or feed the exported roots are loaded.
+
+    Args:
+        spoolDir (str): Directory to take job files from.
+        maxJobs (int, optional): Number of jobs to process before returning,
+            so a supervisor can start a fresh process and reclaim leaked
+            memory. Defaults to 0, which means no limit.
+        pollInterval (float, optional): Seconds to wait between looking for
+            new jobs when the spool directory is empty. Defaults to 1.0.
+    """
+    _initialize()
+    _load_plugin()
+
+    processed = 0
+    while not maxJobs or processed < maxJobs:
+        running_file = _claim_spool_job(spoolDir)
+        if running_file is None:
+            time.sleep(pollInterval)
+            continue
+
+        job_file = running_file[:-len(".running")]
+        result = {"job": os.path.basename(job_file)}
+        start = time.time()
+        try:
+            with open(running_file) as f:
+                job = json.load(f)
+            _run_job(job)
+        except Exception:
+            result["status"] = "failed"
+            result["error"] = traceback.format_exc()
+            print(result["error"])
+        else:
+            result["status"] = "done"
+        finally:
+            cmds.file(new=True, force=True)
+        result["duration"] = time.time() - start
+
+        with open(job_file + ".result", "w") as f:
+            json.dump(result, f, indent=4)
+        os.rename(running_file, "{0}.{1}".format(job_file, result["status"]))
+
+        processed += 1
+
+
+def _claim_spool_job(spoolDir):
+    """
+    Claim the next pending job file in a spool directory.
+
+    Args:
+        spoolDir (str): Directory to take job files from.
+
+    Returns:
+        str: Path to the claimed job file, or None if there are no jobs.
+    """
+    for name in sorted(os.listdir(spoolDir)):
+        if not name.endswith(".json"):
+            continue
+
+        job_file = os.path.join(spoolDir, name)
+        try:
+            os.rename(job_file, job_file + ".running")
+        except OSError:
+            # Claimed by another worker.
+            continue
+
+        return job_file + ".running"
+
+    return None
+
+
+def _run_job(job):
+    """
+    Open the Maya scene of a job and export it.
+
+    Args:
+        job (dict): Job with a "mayaFile", optionally "selectiveReferences",
+            and either the arguments of export(), or a "jobs" list and the
+            evaluation arguments of export_jobs().
+    """
+    job = dict(job)
+
+    roots = None
+    if job.pop("selectiveReferences", False):
+        roots = []
+        for spec in job.get("jobs", [job]):
+            if not spec.get("root"):
+                roots = None
+                break
+            roots.extend(spec["root"])
+
+    _open_scene(job.pop("mayaFile"), roots=roots)
+
+    if "jobs" in job:
+        export_jobs(**job)
+    else:
+        export(**job)
+
+
+# Environment variable with the number of Maya licenses, the default number of
+# processes of an Executor.
+_LICENSES_VARIABLE = "ALEMBIC_EXPORT_LICENSES"
+
+
+class Executor(object):
+    """
+    Run exports in a pool of mayapy processes from any Python host.
+
+    Jobs are objects with a "mayaFile", optionally "selectiveReferences" and
+    "timeout", and the arguments of export(). submit() returns a
+    concurrent.futures Future of the result record, which has the
+    "mayaFile", "alembicFile", "status", "duration" in seconds, "size" of
+    the output, "exitCode" and the captured "log" of the process. A failed,
+    timed out or cancelled export sets a RuntimeError with the end of the log
+    on the Future instead.
+
+    Python 2 needs the "futures" backport of concurrent.futures.
+
+    Args:
+        workers (int, optional): Number of mayapy processes to run at once.
+            Defaults to 0, which means the ALEMBIC_EXPORT_LICENSES
+            environment variable, so the pool stays within the Maya licenses
+            of the host, or the number of cores.
+        timeout (float, optional): Seconds after which a running export is
+            killed, unless a job has its own "timeout". Defaults to None,
+            which means no limit.
+    """
+
+    def __init__(self, workers=0, timeout=None):
+        from concurrent import futures
+
+        workers = workers or int(
+            os.environ.get(_LICENSES_VARIABLE) or multiprocessing.cpu_count()
+        )
+        self.timeout = timeout
+        self._pool = futures.ThreadPoolExecutor(max_workers=workers)
+        self._cancelled = set()
+        self._processes = {}
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, job):
+        """
+        Queue an export.
+
+        Args:
+            job (dict): Job with a "mayaFile" and the arguments of export().
+
+        Returns:
+            concurrent.futures.Future: Future of the result record.
+        """
+        job = dict(job)
+        if not job.get("mayaFile") or not job.get("alembicFile"):
+            raise ValueError("A job needs a \"mayaFile\" and \"alembicFile\".")
+
+        unknown = set(job) - set(_argument_names(export)) - set(
+            ["mayaFile", "selectiveReferences", "timeout"]
+        )
+        if unknown:
+            raise ValueError(
+                "Unknown job arguments: {0}".format(", ".join(sorted(unknown)))
+            )
+
+        token = object()
+        future = self._pool.submit(self._run, job, token)
+        future.token = token
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def submit_async(self, job):
+        """
+        Queue an export from a coroutine of a running asyncio event loop.
+
+        Args:
+            job (dict): Job with a "mayaFile" and the arguments of export().
+
+        Returns:
+            asyncio.Future: Awaitable of the result record.
+        """
+        import asyncio
+
+        return asyncio.wrap_future(self.submit(job))
+
+    def cancel(self, future):
+        """
+        Cancel a queued export, or kill its process when it is running.
+
+        Args:
+            future (concurrent.futures.Future): Future returned by submit().
+
+        Returns:
+            bool: Whether the export was cancelled or killed.
+        """
+        if future.cancel():
+            return True
+
+        # A running export that has not started its process yet aborts
+        # before starting it.
+        with self._lock:
+            if future.done():
+                return False
+            self._cancelled.add(future.token)
+            process = self._processes.get(future.token)
+        if process is not None:
+            _kill(process)
+        return True
+
+    def shutdown(self, wait=True, cancel=False):
+        """
+        Stop accepting jobs and free the pool.
+
+        Args:
+            wait (bool, optional): Wait for the queued and running exports.
+                Defaults to True.
+            cancel (bool, optional): Kill the running exports and drop the
+                queued ones first. Defaults to False.
+        """
+        if cancel:
+            with self._lock:
+                futures = list(self._futures)
+            for future in futures:
+                self.cancel(future)
+        self._pool.shutdown(wait=wait)
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+            self._cancelled.discard(future.token)
+
+    def _run(self, job, token):
+        timeout = job.pop("timeout", self.timeout)
+        selective = job.pop("selectiveReferences", False)
+        mayaFile = job.pop("mayaFile")
+        record = {
+            "mayaFile": mayaFile,
+            "alembicFile": job["alembicFile"],
+            "status": "failed",
+            "size": 0
+        }
+
+        start = time.time()
+        temp_dir = tempfile.mkdtemp()
+        try:
+            command = _export_command(
+                mayaFile, [job], temp_dir, "job",
+                selectiveReferences=selective
+            )
+            with tempfile.TemporaryFile() as log:
+                with self._lock:
+                    if token in self._cancelled:
+                        raise RuntimeError("Export cancelled before start.")
+                    process = subprocess.Popen(
+                        command, stdout=log, stderr=subprocess.STDOUT
+                    )
+                    self._processes[token] = process
+
+                try:
+                    timed_out = False
+                    while process.poll() is None:
+                        if timeout and time.time() - start > timeout:
+                            timed_out = True
+                            _kill(process)
+                        time.sleep(0.1)
+                finally:
+                    with self._lock:
+                        self._processes.pop(token)
+                        cancelled = token in self._cancelled
+
+                log.seek(0)
+                record["log"] = log.read().decode("utf-8", "replace")
+        finally:
+            shutil.rmtree(temp_dir)
+
+        record["duration"] = time.time() - start
+        record["exitCode"] = process.returncode
+
+        error = None
+        if cancelled:
+            error = "Export cancelled"
+        elif timed_out:
+            error = "Export timed out after {0} seconds".format(timeout)
+        elif process.returncode:
+            error = "Export failed with exit code {0}".format(
+                process.returncode
+            )
+        if error:
+            raise RuntimeError(
+                "{0}: {1}\n{2}".format(
+                    error, job["alembicFile"], record["log"][-2000:]
+                )
+            )
+
+        record["status"] = "done"
+        if os.path.isfile(job["alembicFile"]):
+            record["size"] = os.path.getsize(job["alembicFile"])
+        return record
+
+
+def _kill(process):
+    """
+    Kill a process that may have exited already.
+
+    Args:
+        process (subprocess.Popen): Process to kill.
+    """
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+def _abc_export(jobs,
+                dontSkipUnwrittenFrames=False,
+                verbose=False,
+                preRollStartFrame=0):
+    """
+    Run AbcExport with one or more jobs.
+
+    Args:
+        jobs (list of dict): Arguments of _job_arg() for each job.
+        dontSkipUnwrittenFrames (bool, optional): See export().
+        verbose (bool, optional): See export().
+        preRollStartFrame (float, optional): See export().
+    """
+    jobs = [dict(job) for job in jobs]
+
+    # Callables are dispatched through a single statement per job, which
+    # only AbcExport compiles.
+    _job_callbacks.clear()
+    for index, job in enumerate(jobs):
+        code, callables = _split_callables(
+            job.get("pythonPerFrameCallback", "")
+        )
+        if callables:
+            _job_callbacks[index] = callables
+            hook = (
+                "import sys; sys.modules['{0}']._on_job_frame("
+                "{1}, #FRAME#, #BOUNDSARRAY#)".format(__name__, index)
+            )
+            code = "\n".join([item for item in (hook, code) if item])
+        job["pythonPerFrameCallback"] = code
+
+    # The frame callbacks are run once per frame, so only the first job
+    # needs to call them.
+    if _frame_callbacks:
+        hook = "import sys; sys.modules['{0}']._on_frame(#FRAME#)".format(
+            __name__
+        )
+        callback = jobs[0].get("pythonPerFrameCallback")
+        jobs[0]["pythonPerFrameCallback"] = "\n".join(
+            [code for code in (hook, callback) if code]
+        )
+
+    # Replace rather than overwrite existing files, as they may be hard
+    # links into the export cache. Outputs in a scratch directory are new
+    # files, and their destinations are only replaced by the transfer.
+    for job in jobs:
+        if os.path.isfile(job["alembicFile"]):
+            _remove(job["alembicFile"])
+
+    jobArg = [_job_arg(**job) for job in jobs]
+    if len(jobArg) == 1:
+        jobArg = jobArg[0]
+
+    # Execute export
+    _load_plugin()
+
+    export_args = {
+        "dontSkipUnwrittenFrames": dontSkipUnwrittenFrames,
+        "verbose": verbose,
+        "preRollStartFrame": preRollStartFrame,
+        "jobArg": jobArg
+    }
+
+    print("Exporting with: {0}".format(export_args))
+
+    try:
+        with _phase("export"):
+            cmds.AbcExport(**export_args)
+    finally:
+        _job_callbacks.clear()
+
+
+# Files in a scratch directory of the running exports, see _scratch().
+_scratch_files = set()
+
+
+@contextlib.contextmanager
+def _scratch(jobs, scratchDir, checksum=False):
+    """
+    Redirect the output of jobs to a scratch directory, and transfer the
+    files to their destination when the export succeeds.
+
+    Args:
+        jobs (list of dict): Arguments of _job_arg() for each job.
+        scratchDir (str): Local directory to write to. Jobs are not
+            redirected when None.
+        checksum (bool, optional): See export().
+
+    Yields:
+        list of dict: Jobs writing to the scratch directory.
+    """
+    if not scratchDir:
+        yield jobs
+        return
+
+    if not os.path.isdir(scratchDir):
+        os.makedirs(scratchDir)
+
+    scratch_jobs = []
+    for job in jobs:
+        handle, path = tempfile.mkstemp(
+            suffix="_" + os.path.basename(job["alembicFile"]),
+            dir=scratchDir
+        )
+        os.close(handle)
+        _scratch_files.add(path)
+        scratch_jobs.append(dict(job, alembicFile=path))
+
+    try:
+        yield scratch_jobs
+
+        with _phase("transfer"):
+            for job, scratch_job in zip(jobs, scratch_jobs):
+                _transfer(
+                    scratch_job["alembicFile"],
+                    job["alembicFile"],
+                    checksum=checksum
+                )
+    finally:
+        for job in scratch_jobs:
+            _scratch_files.discard(job["alembicFile"])
+            if os.path.exists(job["alembicFile"]):
+                os.remove(job["alembicFile"])
+
+
+def _transfer(source, destination, checksum=False):
+    """
+    Copy a file in one sequential pass and rename it into place.
+
+    The file is copied to a temporary file next to the destination, so the
+    final rename is atomic on the destination file system.
+
+    Args:
+        source (str): File to copy.
+        destination (str): File location to copy to.
+        checksum (bool, optional): Verify the copy with a SHA-1 checksum and
+            write it to "<destination>.sha1". Defaults to False.
+    """
+    temp_file = "{0}.{1}.tmp".format(destination, os.getpid())
+    sha1 = hashlib.sha1()
+    try:
+        with open(source, "rb") as src, open(temp_file, "wb") as dst:
+            for chunk in iter(lambda: src.read(16 * 1024 * 1024), b""):
+                if checksum:
+                    sha1.update(chunk)
+                dst.write(chunk)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        if checksum:
+            if _file_sha1(temp_file) != sha1.hexdigest():
+                raise IOError(
+                    "Checksum mismatch copying {0} to {1}".format(
+                        source, temp_file
+                    )
+                )
+            with open(destination + ".sha1", "w") as f:
+                f.write(
+                    "{0}  {1}\n".format(
+                        sha1.hexdigest(), os.path.basename(destination)
+                    )
+                )
+
+        _replace(temp_file, destination)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def _replace(source, destination):
+    """
+    Rename a file over another, atomically where the platform allows.
+
+    Args:
+        source (str): File to rename.
+        destination (str): File location to rename it to.
+    """
+    # os.replace is atomic on every platform, but Python 2 only has
+    # os.rename which fails on Windows when the destination exists.
+    replace = getattr(os, "replace", None)
+    if os.name == "nt" and os.path.exists(destination):
+        if replace is None:
+            _remove(destination)
+        else:
+            # Windows does not replace read-only files, like cache entries.
+            os.chmod(destination, stat.S_IWRITE)
+    replace = replace or os.rename
+    replace(source, destination)
+
+
+def _remove(path):
+    """
+    Remove a file, even a read-only one on Windows.
+
+    Args:
+        path (str): File to remove.
+    """
+    if os.name == "nt":
+        os.chmod(path, stat.S_IWRITE)
+    os.remove(path)
+
+
+# Types of the nodes that make their outputs change over time.
+_TIME_DEPENDENT_TYPES = [
+    "animCurveTA",
+    "animCurveTL",
+    "animCurveTT",
+    "animCurveTU",
+    "expression"
+]
+
+
+def _animated_roots(roots, worldSpace=False):
+    """
+    Find the roots with time dependent inputs.
+
+    A root is animated when it, its descendants, or with worldSpace its
+    parents, have animation curves, expressions or nodes driven by time
+    upstream.
+
+    Args:
+        roots (list of str): Maya dag paths to check.
+        worldSpace (bool, optional): Whether the parents of the roots are
+            written into their transforms. Defaults to False.
+
+    Returns:
+        list of str: Animated roots, in the order given.
+    """
+    time_nodes = set(
+        cmds.ls(
+            cmds.listConnections("time1", source=False, destination=True)
+            or [],
+            long=True
+        )
+    )
+
+    animated = []
+    for root in roots:
+        nodes = cmds.ls(root, long=True)
+        if worldSpace:
+            for path in list(nodes):
+                names = path.split("|")
+                for index in range(2, len(names)):
+                    nodes.append("|".join(names[:index]))
+        nodes += cmds.listRelatives(
+            nodes, allDescendents=True, fullPath=True
+        ) or []
+
+        history = cmds.ls(cmds.listHistory(nodes) or [], long=True)
+        if (time_nodes.intersection(history) or
+                cmds.ls(history, type=_TIME_DEPENDENT_TYPES)):
+            animated.append(root)
+
+    return animated
+
+
+def _split_static(job):
+    """
+    Split a job into a single sample job for static roots and a job for
+    animated roots.
+
+    Roots are classified by _animated_roots().
+
+    Args:
+        job (dict): Arguments of _job_arg() for the job.
+
+    Returns:
+        list of dict: Jobs to export. The animated job comes first and keeps
+            the alembicFile of the job.
+    """
+    roots = job["root"] or cmds.ls(assemblies=True, long=True)
+    animated = _animated_roots(roots, job["worldSpace"])
+    static = [root for root in roots if root not in animated]
+
+    print(
+        "Splitting {0} animated and {1} static roots".format(
+            len(animated), len(static)
+        )
+    )
+
+    static_job = dict(job, root=static, frameRelativeSample=[])
+    if job["frameRange"]:
+        start = job["frameRange"][0][0]
+        static_job["frameRange"] = [[start, start]]
+
+    if not animated:
+        return [static_job]
+    if not static:
+        return [job]
+
+    # Callbacks run with the animated job only.
+    static_job["alembicFile"] = "{0}.static{1}".format(
+        *os.path.splitext(job["alembicFile"])
+    )
+    for key in ("melPerFrameCallback",
+                "melPostJobCallback",
+                "pythonPerFrameCallback",
+                "pythonPostJobCallback"):
+        static_job[key] = ""
+    return [dict(job, root=animated), static_job]
+
+
+# Evaluators toggled by export(), by argument name.
+_EVALUATORS = {"cachedPlayback": "cache", "gpuOverride": "deformer"}
+
+
+@contextlib.contextmanager
+def _evaluation_settings(evaluationMode=None,
+                         threadCount=None,
+                         cachedPlayback=None,
+                         gpuOverride=None):
+    """
+    Apply evaluation settings for the duration of the export.
+
+    Settings that are None are left as they are, the others are restored
+    afterwards.
+
+    Args:
+        evaluationMode (str, optional): See export().
+        threadCount (int, optional): See export().
+        cachedPlayback (bool, optional): See export().
+        gpuOverride (bool, optional): See export().
+    """
+    restore = []
+
+    if evaluationMode is not None:
+        mode = cmds.evaluationManager(query=True, mode=True)[0]
+        cmds.evaluationManager(mode=evaluationMode)
+        restore.append(lambda: cmds.evaluationManager(mode=mode))
+
+    if threadCount is not None:
+        count = cmds.threadCount(query=True, numberOfThreads=True)
+        cmds.threadCount(numberOfThreads=threadCount)
+        restore.append(lambda: cmds.threadCount(numberOfThreads=count))
+
+    evaluators = {"cachedPlayback": cachedPlayback, "gpuOverride": gpuOverride}
+    for key, enable in sorted(evaluators.items()):
+        if enable is None:
+            continue
+        name = _EVALUATORS[key]
+        try:
+            enabled = cmds.evaluator(name=name, query=True, enable=True)
+        except RuntimeError:
+            print("Evaluator not available for {0}: {1}".format(key, name))
+            continue
+        cmds.evaluator(name=name, enable=bool(enable))
+        restore.append(
+            lambda name=name, enabled=enabled: cmds.evaluator(
+                name=name, enable=enabled
+            )
+        )
+
+    try:
+        yield
+    finally:
+        for function in reversed(restore):
+            function()
+
+
+# Types of the nodes disabled when pruning, the nodes that are evaluated every
+# frame or are expensive to evaluate.
+_PRUNED_TYPES = [
+    "animCurve",
+    "cacheFile",
+    "constraint",
+    "expression",
+    "geometryFilter",
+    "hairSystem",
+    "ikHandle",
+    "motionPath",
+    "nBase",
+    "nucleus",
+    "polyBase"
+]
+
+
+@contextlib.contextmanager
+def _pruned(roots, restore=True):
+    """
+    Disable the evaluated nodes that are not upstream of the roots.
+
+    Nodes are disabled by setting their node state to blocking, which stops
+    them from being evaluated. Nodes whose node state is locked, connected or
+    not normal are left alone.
+
+    Args:
+        roots (list of str): Maya dag paths that are exported. Nothing is
+            disabled when empty or None.
+        restore (bool, optional): Restore the node states afterwards.
+            Defaults to True.
+    """
+    disabled = {}
+    if roots:
+        with _phase("prune"):
+            # Everything the roots inherit from or are evaluated from.
+            nodes = cmds.ls(roots, long=True)
+            for root in list(nodes):
+                names = root.split("|")
+                for index in range(2, len(names)):
+                    nodes.append("|".join(names[:index]))
+            nodes += cmds.listRelatives(
+                nodes, allDescendents=True, fullPath=True
+            ) or []
+            upstream = set(nodes)
+            if nodes:
+                upstream.update(
+                    cmds.ls(cmds.listHistory(nodes), long=True)
+                )
+
+            for node in cmds.ls(type=_PRUNED_TYPES, long=True):
+                plug = node + ".nodeState"
+                if node in upstream or not cmds.getAttr(plug, settable=True):
+                    continue
+                state = cmds.getAttr(plug)
+                if state == 0:
+                    cmds.setAttr(plug, 2)
+                    disabled[plug] = state
+
+            print("Pruned {0} nodes".format(len(disabled)))
+
+    try:
+        yield
+    finally:
+        if restore:
+            for plug, state in disabled.items():
+                cmds.setAttr(plug, state)
+
+
+def _job_arg(alembicFile,
+             eulerFilter=False,
+             noNormals=False,
+             preRoll=False,
+             renderableOnly=False,
+             selection=False,
+             uvWrite=False,
+             writeColorSets=False,
+             writeFaceSets=False,
+             wholeFrameGeo=False,
+             worldSpace=False,
+             writeVisibility=False,
+             writeUVSets=False,
+             writeCreases=False,
+             dataFormat="Ogawa",
+             step=1.0,
+             melPerFrameCallback="",
+             melPostJobCallback="",
+             pythonPerFrameCallback="",
+             pythonPostJobCallback="",
+             userAttr=[],
+             userAttrPrefix=["ABC_"],
+             attr=[],
+             attrPrefix=[],
+             root=[],
+             frameRelativeSample=[],
+             frameRange=[],
+             stripNamespaces=-1
+             ):
+    """
+    Build the AbcExport job argument for a single job.
+
+    Args:
+        alembicFile (str): File location to write the Alembic data.
+        See export() for the remaining arguments.
+
+    Returns:
+        str: Job argument to pass to AbcExport.
+    """
+
+    # Generate job argument
+    jobArg = ""
+
+    # Boolean flags
+    booleans = {
+        "eulerFilter": eulerFilter,
+        "noNormals": noNormals,
+        "preRoll": preRoll,
+        "renderableOnly": renderableOnly,
+        "selection": selection,
+        "uvWrite": uvWrite,
+        "writeColorSets": writeColorSets,
+        "writeFaceSets": writeFaceSets,
+        "wholeFrameGeo": wholeFrameGeo,
+        "worldSpace": worldSpace,
+        "writeVisibility": writeVisibility,
+        "writeUVSets": writeUVSets,
+        "writeCreases": writeCreases
+    }
+    for key, value in booleans.items():
+        if value:
+            jobArg += " -{0}".format(key)
+
+    # Single argument flags
+    single_arguments = {
+        "dataFormat": dataFormat,
+        "step": step,
+        "melPerFrameCallback": melPerFrameCallback,
+        "melPostJobCallback": melPostJobCallback,
+        "pythonPerFrameCallback": pythonPerFrameCallback,
+        "pythonPostJobCallback": pythonPostJobCallback
+    }
+    for key, value in single_arguments.items():
+        if value:
+            jobArg += " -{0} \"{1}\"".format(key, value)
+
+    # Multiple arguments flags
+    multiple_arguments = {
+        "attr": attr,
+        "attrPrefix": attrPrefix,
+        "root": root,
+        "userAttrPrefix": userAttrPrefix,
+        "userAttr": userAttr,
+        "frameRelativeSample": frameRelativeSample
+    }
+    for key, value in multiple_arguments.items():
+        for item in value:
+            jobArg += " -{0} \"{1}\"".format(key, item)
+
+    # frame range flag
+    for start, end in frameRange:
+        jobArg += " -frameRange {0} {1}".format(start, end)
+
+    # strip namespaces flag
+    if stripNamespaces == 0:
+        jobArg += " -stripNamespaces"
+    if stripNamespaces > 0:
+        jobArg += " -stripNamespaces {0}".format(stripNamespaces)
+
+    # file flag
+    # Alembic exporter does not like back slashes
+    jobArg += " -file {0}".format(alembicFile.replace("\\", "/"))
 
-    cmds.AbcExport(**export_args)
+    return jobArg
 
 
 if __name__ == "__main__":
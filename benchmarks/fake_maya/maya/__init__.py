@@ -0,0 +1 @@
+"""Stand-in for the maya package, for benchmarking without a Maya license."""
@@ -0,0 +1,152 @@
+"""
+Stand-in for maya.cmds, for benchmarking without a Maya license.
+
+Only the commands used by alembic_export are implemented. Opening a scene and
+sampling a frame sleep for a configurable time, and every AbcExport call is
+recorded in "calls".
+"""
+
+import shlex
+import time
+
+import __main__
+
+# Simulated cost in seconds of booting Maya, opening a scene and sampling a
+# frame for a single root.
+costs = {"initialize": 0.0, "open": 0.0, "frame": 0.0}
+
+# Total simulated cost, to tell it apart from the orchestration overhead.
+simulated = {"seconds": 0.0}
+
+# Keyword arguments of every AbcExport call.
+calls = []
+
+_scene = {"name": "", "modified": False}
+
+
+def configure(initialize=0.0, open=0.0, frame=0.0):
+    """
+    Set the simulated costs and forget earlier calls.
+
+    Args:
+        initialize (float, optional): Seconds to boot Maya.
+        open (float, optional): Seconds to open a scene.
+        frame (float, optional): Seconds to sample a frame per root.
+    """
+    costs.update(initialize=initialize, open=open, frame=frame)
+    simulated["seconds"] = 0.0
+    del calls[:]
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    simulated["seconds"] += seconds
+
+
+def file(*args, **kwargs):
+    if kwargs.get("open"):
+        _sleep(costs["open"])
+        _scene["name"] = args[0]
+    elif kwargs.get("new"):
+        _scene["name"] = ""
+    elif kwargs.get("query"):
+        if kwargs.get("sceneName"):
+            return _scene["name"]
+        if kwargs.get("modified"):
+            return _scene["modified"]
+
+
+def loadPlugin(*args, **kwargs):
+    pass
+
+
+# Every named node exists as a transform with a mesh shape below it, and the
+# scene has no other nodes.
+def _names(args):
+    names = []
+    for arg in args:
+        names.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+    return names
+
+
+def _children(name):
+    if name.endswith("Shape"):
+        return []
+    return ["{0}|{1}Shape".format(name, name.rpartition("|")[2])]
+
+
+def _node_type(name):
+    return "mesh" if name.endswith("Shape") else "transform"
+
+
+def ls(*args, **kwargs):
+    names = _names(args)
+    if kwargs.get("dag"):
+        names += [child for name in names for child in _children(name)]
+
+    types = kwargs.get("type")
+    if types:
+        types = types if isinstance(types, (list, tuple)) else [types]
+        names = [
+            name for name in names
+            if "dagNode" in types or _node_type(name) in types
+        ]
+    return names
+
+
+def listRelatives(*args, **kwargs):
+    return [child for name in _names(args) for child in _children(name)]
+
+
+def AbcExport(**kwargs):
+    calls.append(kwargs)
+
+    jobArg = kwargs["jobArg"]
+    if not isinstance(jobArg, list):
+        jobArg = [jobArg]
+    jobs = [_parse_job(job) for job in jobArg]
+
+    # Like AbcExport, every frame is evaluated once for all jobs.
+    frames = set()
+    for job in jobs:
+        for start, end in job["frameRange"] or [(1.0, 1.0)]:
+            frame = start
+            while frame <= end:
+                frames.add(frame)
+                frame += job["step"]
+
+    roots = sum(max(len(job["root"]), 1) for job in jobs)
+    for frame in sorted(frames):
+        _sleep(costs["frame"] * roots)
+        for job in jobs:
+            if job["pythonPerFrameCallback"]:
+                code = job["pythonPerFrameCallback"].replace(
+                    "#FRAME#", repr(frame)
+                ).replace("#BOUNDSARRAY#", "[0.0, 0.0, 0.0, 1.0, 1.0, 1.0]")
+                exec(code, __main__.__dict__)
+
+    for job in jobs:
+        with open(job["file"], "w") as f:
+            f.write("{0} samples".format(len(frames)))
+
+
+def _parse_job(jobArg):
+    job = {
+        "frameRange": [],
+        "root": [],
+        "step": 1.0,
+        "pythonPerFrameCallback": ""
+    }
+    tokens = shlex.split(jobArg)
+    while tokens:
+        flag = tokens.pop(0)[1:]
+        if flag == "frameRange":
+            job["frameRange"].append((float(tokens.pop(0)),
+                                      float(tokens.pop(0))))
+        elif flag == "root":
+            job["root"].append(tokens.pop(0))
+        elif flag == "step":
+            job["step"] = float(tokens.pop(0))
+        elif flag in ("file", "pythonPerFrameCallback"):
+            job[flag] = tokens.pop(0)
+    return job
@@ -0,0 +1,11 @@
+"""Stand-in for maya.standalone."""
+
+import time
+
+from maya import cmds
+
+
+def initialize(name="python"):
+    """Simulate booting Maya."""
+    time.sleep(cmds.costs["initialize"])
+    cmds.simulated["seconds"] += cmds.costs["initialize"]
@@ -0,0 +1,202 @@
+"""
+Benchmark the orchestration of alembic_export without Maya.
+
+maya.standalone and maya.cmds are replaced by the stand-ins in "fake_maya",
+which simulate the cost of opening a scene and sampling frames. Every result
+reports the wall time, the simulated Maya time and the difference, which is
+the overhead of alembic_export itself.
+
+    $ python benchmarks/run.py --output results.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(directory, "fake_maya"))
+sys.path.insert(0, os.path.dirname(directory))
+
+import alembic_export  # noqa: E402
+from maya import cmds  # noqa: E402
+
+
+def bench_export(output_dir, jobs, frames, roots):
+    """Export the jobs one after another with export()."""
+    for number in range(jobs):
+        alembic_export.export(
+            os.path.join(output_dir, "{0}.abc".format(number)),
+            root=_roots(roots),
+            frameRange=[[1, frames]]
+        )
+
+
+def bench_export_jobs(output_dir, jobs, frames, roots):
+    """Export the jobs in a single pass with export_jobs()."""
+    alembic_export.export_jobs(
+        [
+            {
+                "alembicFile": os.path.join(
+                    output_dir, "{0}.abc".format(number)
+                ),
+                "root": _roots(roots),
+                "frameRange": [[1, frames]]
+            }
+            for number in range(jobs)
+        ]
+    )
+
+
+def bench_batch(output_dir, jobs, frames, roots):
+    """Export the jobs from a manifest of two scenes with batch()."""
+    alembic_export.batch(
+        [
+            {
+                "mayaFile": "scene{0}.mb".format(number % 2),
+                "alembicFile": os.path.join(
+                    output_dir, "{0}.abc".format(number)
+                ),
+                "root": _roots(roots),
+                "frameRange": [[1, frames]]
+            }
+            for number in range(jobs)
+        ]
+    )
+
+
+def bench_worker(output_dir, jobs, frames, roots):
+    """Export the jobs from a spool directory with worker()."""
+    spool_dir = os.path.join(output_dir, "spool")
+    os.mkdir(spool_dir)
+    for number in range(jobs):
+        with open(os.path.join(spool_dir, "{0:04d}.json".format(number)),
+                  "w") as f:
+            json.dump(
+                {
+                    "mayaFile": "scene.mb",
+                    "alembicFile": os.path.join(
+                        output_dir, "{0}.abc".format(number)
+                    ),
+                    "root": _roots(roots),
+                    "frameRange": [[1, frames]]
+                },
+                f
+            )
+    alembic_export.worker(spool_dir, maxJobs=jobs, pollInterval=0)
+
+
+def _roots(count):
+    return ["|root{0}".format(number) for number in range(count)]
+
+
+benchmarks = {
+    "export": bench_export,
+    "export_jobs": bench_export_jobs,
+    "batch": bench_batch,
+    "worker": bench_worker
+}
+
+
+def run(modes, job_counts, frame_counts, root_counts, costs, repeat):
+    """
+    Run the benchmarks for every combination of job, frame and root counts.
+
+    Returns:
+        list of dict: Result per combination, with the best of the repeats.
+    """
+    results = []
+    combinations = itertools.product(
+        modes, job_counts, frame_counts, root_counts
+    )
+    for mode, jobs, frames, roots in combinations:
+        best = None
+        for _ in range(repeat):
+            output_dir = tempfile.mkdtemp()
+            cmds.file("scene.mb", open=True)
+            cmds.configure(**costs)
+
+            stdout = sys.stdout
+            sys.stdout = open(os.devnull, "w")
+            start = time.time()
+            try:
+                benchmarks[mode](output_dir, jobs, frames, roots)
+            finally:
+                seconds = time.time() - start
+                sys.stdout.close()
+                sys.stdout = stdout
+                shutil.rmtree(output_dir)
+
+            if best is None or seconds < best["seconds"]:
+                simulated = cmds.simulated["seconds"]
+                best = {
+                    "mode": mode,
+                    "jobs": jobs,
+                    "frames": frames,
+                    "roots": roots,
+                    "seconds": seconds,
+                    "simulatedSeconds": simulated,
+                    "overheadSeconds": seconds - simulated,
+                    "abcExportCalls": len(cmds.calls),
+                    "framesPerSecond": jobs * frames / seconds
+                }
+        results.append(best)
+        sys.stderr.write(
+            "{mode:12} jobs={jobs:<4} frames={frames:<6} roots={roots:<4} "
+            "{seconds:8.4f}s overhead={overheadSeconds:8.4f}s\n".format(**best)
+        )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "--modes", nargs="+", default=sorted(benchmarks),
+        choices=sorted(benchmarks)
+    )
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--frames", type=int, nargs="+", default=[10, 250])
+    parser.add_argument("--roots", type=int, nargs="+", default=[1, 10])
+    parser.add_argument(
+        "--open-cost", type=float, default=0.01,
+        help="Simulated seconds to open a scene."
+    )
+    parser.add_argument(
+        "--frame-cost", type=float, default=0.0,
+        help="Simulated seconds to sample a frame per root."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output", help="File to write the JSON results to, instead of "
+        "standard output."
+    )
+    args = parser.parse_args()
+
+    results = run(
+        args.modes, args.jobs, args.frames, args.roots,
+        {"open": args.open_cost, "frame": args.frame_cost},
+        args.repeat
+    )
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "openCost": args.open_cost,
+        "frameCost": args.frame_cost,
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()